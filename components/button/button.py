@@ -1,24 +1,87 @@
 """
 Button component class with all Button-specific functions
 """
-from playwright.sync_api import Page, Locator
-from typing import Optional, Dict, Any
-from framework.base import PropertyChecker
+import itertools
+import json
+import weakref
+from enum import Enum
+from playwright.sync_api import Page, Locator, BrowserContext, TimeoutError as PlaywrightTimeoutError
+from typing import Optional, Dict, Any, Tuple, Union
+from framework.base import PropertyChecker, StorybookControlsManager
 from components.button.locators import ButtonLocators
 from utils.logger import logger
 
+
+class ButtonVariant(str, Enum):
+    """Figma button variants (values match button.properties keys and Storybook args)"""
+    PRIMARY = "primary"
+    SECONDARY = "secondary"
+    GHOST = "ghost"
+    LINK = "link"
+    WARNING = "warning"
+
+
+class ButtonState(str, Enum):
+    """Figma button states"""
+    ACTIVE = "active"
+    HOVER = "hover"
+    CLICK = "click"
+    DISABLED = "disabled"
+    LOADING = "loading"
+
+
+class ButtonSize(str, Enum):
+    """Figma button sizes"""
+    LARGE = "large"
+    MEDIUM = "medium"
+    SMALL = "small"
+
+
+# Default Button story; the session-wide button fixture (conftest.py) starts here
+BUTTON_STORY_PATH = "main-button--primary"
+
 # Figma variant/state/size for tracking and verification (see button.properties)
-BUTTON_VARIANTS = ("primary", "secondary", "ghost", "link", "warning")
-BUTTON_STATES = ("active", "hover", "click", "disabled", "loading")
-BUTTON_SIZES = ("large", "medium", "small")
+BUTTON_VARIANTS = tuple(v.value for v in ButtonVariant)
+BUTTON_STATES = tuple(s.value for s in ButtonState)
+BUTTON_SIZES = tuple(z.value for z in ButtonSize)
+# Full variant × state × size matrix, computed once at import
+BUTTON_MATRIX = tuple(itertools.product(BUTTON_VARIANTS, BUTTON_STATES, BUTTON_SIZES))
 THEME_MODES = ("light", "light-hc", "dark", "dark-hc")
 BUTTON_COLOR_PROPERTIES = ("background-color", "color", "border-color")
+# Set view of BUTTON_COLOR_PROPERTIES for O(1) membership checks when filtering
+_COLOR_SET = frozenset(BUTTON_COLOR_PROPERTIES)
+
+# Browser contexts that already carry the __btnHelpers init script
+_HELPER_CONTEXTS: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+
+# In-page function returning the full button state in one evaluate.
+# Installed as window.__btnHelpers.state by an init script registered once per browser context
+# (see ButtonComponent.__init__).
+_BUTTON_STATE_FN = """el => {
+    const span = el.querySelector("span.visible, span[class*='visible']");
+    return {
+        text: (span || el).innerText,
+        label: el.getAttribute('aria-label'),
+        disabled: el.matches(%s),
+        loading: el.matches(%s),
+        active: el.matches(%s),
+    };
+}""" % (
+    json.dumps(ButtonLocators.BUTTON_DISABLED_MATCHER),
+    json.dumps(ButtonLocators.BUTTON_LOADING_MATCHER),
+    json.dumps(ButtonLocators.BUTTON_ACTIVE_MATCHER),
+)
 
 
 class ButtonComponent(PropertyChecker):
     """
     Button component class with all Button-specific functionality
     """
+
+    # (variant, state, size) -> expected properties; shared by all instances, filled lazily.
+    # button.properties is static for a run, so cached dicts are shared - treat as read-only.
+    _PROPS_CACHE: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+    _COLOR_PROPS_CACHE: Dict[Tuple[str, str, str], Dict[str, str]] = {}
     
     def __init__(self, page: Page, storybook_url: str = None):
         """
@@ -30,6 +93,19 @@ class ButtonComponent(PropertyChecker):
         """
         super().__init__(page, storybook_url)
         self.locators = ButtonLocators()
+        # Default button locator is built once so get_button() is a single attribute load.
+        # Locators are lazy (re-resolved on every action), so it stays valid across navigations.
+        self._default_button: Locator = self.get_story_locator(self.locators.BUTTON)
+        # CDP session for bulk Actions-panel reads; created on first use (False = unsupported)
+        self._cdp = None
+        # Expose the state helper in every frame (incl. the story iframe) on each navigation.
+        # Registered once per browser context - every instance on the shared page reuses it.
+        context = page.context
+        if context not in _HELPER_CONTEXTS:
+            context.add_init_script(
+                "window.__btnHelpers = window.__btnHelpers || { state: %s };" % _BUTTON_STATE_FN
+            )
+            _HELPER_CONTEXTS.add(context)
     
     def get_button(self, selector: Optional[str] = None) -> Locator:
         """
@@ -39,9 +115,12 @@ class ButtonComponent(PropertyChecker):
             selector: Optional custom selector, defaults to main button selector
             
         Returns:
-            Button locator (first match if multiple buttons found)
+            Button locator (first match if multiple buttons found; resolution stops at the
+            first match, so no strictness check over all candidates)
         """
-        return self.get_story_locator(selector or self.locators.BUTTON)
+        if selector is None:
+            return self._default_button
+        return self.get_story_locator(selector)
     
     def click_button(self, selector: Optional[str] = None):
         """
@@ -52,7 +131,8 @@ class ButtonComponent(PropertyChecker):
         """
         button = self.get_button(selector)
         button.click()
-        self.wait_for_animation()
+        self._wait_for_animations(button)
+        self.clear_declared_style_cache()
     
     def click_button_by_text(self, text: str):
         """
@@ -64,6 +144,21 @@ class ButtonComponent(PropertyChecker):
         selector = self.locators.button_with_text(text)
         self.click_button(selector)
     
+    def get_button_state(self, selector: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the full button state in a single evaluate
+        
+        Args:
+            selector: Optional custom selector
+            
+        Returns:
+            Dict with keys: text, label, disabled, loading, active
+        """
+        # Helper is missing until the first navigation after this component was created
+        return self.get_button(selector).evaluate(
+            "el => window.__btnHelpers ? window.__btnHelpers.state(el) : (%s)(el)" % _BUTTON_STATE_FN
+        )
+    
     def is_button_enabled(self, selector: Optional[str] = None) -> bool:
         """
         Check if button is enabled
@@ -87,13 +182,7 @@ class ButtonComponent(PropertyChecker):
         Returns:
             True if button is disabled, False otherwise
         """
-        button = self.get_button(selector)
-        aria_disabled = button.get_attribute("aria-disabled")
-        return (
-            button.is_disabled() or 
-            button.get_attribute("disabled") is not None or
-            aria_disabled == "true"
-        )
+        return self.get_button_state(selector)["disabled"]
     
     def get_button_text(self, selector: Optional[str] = None) -> str:
         """
@@ -105,12 +194,7 @@ class ButtonComponent(PropertyChecker):
         Returns:
             Button text content (from visible span if present, otherwise inner text)
         """
-        button = self.get_button(selector)
-        # Try to get text from visible span first (matches DOM structure)
-        visible_span = button.locator("span.visible, span[class*='visible']")
-        if visible_span.count() > 0:
-            return visible_span.first.inner_text()
-        return button.inner_text()
+        return self.get_button_state(selector)["text"]
     
     def get_button_label(self, selector: Optional[str] = None) -> Optional[str]:
         """
@@ -122,8 +206,7 @@ class ButtonComponent(PropertyChecker):
         Returns:
             Button label from aria-label attribute, or None if not found
         """
-        button = self.get_button(selector)
-        aria_label = button.get_attribute("aria-label")
+        aria_label = self.get_button_state(selector)["label"]
         return aria_label if aria_label else None
     
     def verify_button_text(self, expected_text: str, selector: Optional[str] = None):
@@ -172,32 +255,56 @@ class ButtonComponent(PropertyChecker):
             f"Button variant mismatch: expected class '{expected_class}' in '{button_class}'"
 
     def load_button_variant_properties(
-        self, variant: str, state: str, size: str
+        self,
+        variant: Union[ButtonVariant, str],
+        state: Union[ButtonState, str],
+        size: Union[ButtonSize, str],
     ) -> Dict[str, str]:
         """
         Load expected CSS properties for a variant/state/size from button.properties.
 
         Args:
-            variant: primary, secondary, ghost, link, warning
-            state: active, hover, disabled, click, loading
-            size: large, medium, small
+            variant: primary, secondary, ghost, link, warning (str or ButtonVariant)
+            state: active, hover, disabled, click, loading (str or ButtonState)
+            size: large, medium, small (str or ButtonSize)
 
         Returns:
             Dict of CSS property name -> expected value (e.g. {"background-color": "rgb(...)", ...})
         """
-        return self.load_component_properties_for_variant(
-            variant=variant, state=state, size=size, component_name="button"
+        key = (
+            getattr(variant, "value", variant),
+            getattr(state, "value", state),
+            getattr(size, "value", size),
         )
+        props = self._PROPS_CACHE.get(key)
+        if props is None:
+            props = self.load_component_properties_for_variant(
+                variant=key[0], state=key[1], size=key[2], component_name="button"
+            )
+            self._PROPS_CACHE[key] = props
+        return props
 
     def load_button_variant_color_properties(
-        self, variant: str, state: str, size: str
+        self,
+        variant: Union[ButtonVariant, str],
+        state: Union[ButtonState, str],
+        size: Union[ButtonSize, str],
     ) -> Dict[str, str]:
         """
         Load only color properties (background-color, color, border-color) for a variant/state/size
         from button.properties.
         """
-        all_props = self.load_button_variant_properties(variant, state, size)
-        return {k: v for k, v in all_props.items() if k in BUTTON_COLOR_PROPERTIES}
+        key = (
+            getattr(variant, "value", variant),
+            getattr(state, "value", state),
+            getattr(size, "value", size),
+        )
+        colors = self._COLOR_PROPS_CACHE.get(key)
+        if colors is None:
+            all_props = self.load_button_variant_properties(*key)
+            colors = {k: v for k, v in all_props.items() if k in _COLOR_SET}
+            self._COLOR_PROPS_CACHE[key] = colors
+        return colors
 
     def hover_button(self, selector: Optional[str] = None):
         """
@@ -208,7 +315,8 @@ class ButtonComponent(PropertyChecker):
         """
         button = self.get_button(selector)
         button.hover()
-        self.wait_for_animation()
+        self._wait_for_animations(button)
+        self.clear_declared_style_cache()
     
     def is_button_loading(self, selector: Optional[str] = None) -> bool:
         """
@@ -220,9 +328,7 @@ class ButtonComponent(PropertyChecker):
         Returns:
             True if button is loading, False otherwise
         """
-        button = self.get_button(selector)
-        aria_busy = button.get_attribute("aria-busy")
-        return aria_busy == "true"
+        return self.get_button_state(selector)["loading"]
     
     def is_button_active(self, selector: Optional[str] = None) -> bool:
         """
@@ -234,9 +340,7 @@ class ButtonComponent(PropertyChecker):
         Returns:
             True if button is active, False otherwise
         """
-        button = self.get_button(selector)
-        data_active = button.get_attribute("data-active")
-        return data_active == "true"
+        return self.get_button_state(selector)["active"]
     
     def verify_button_loading(self, selector: Optional[str] = None):
         """
@@ -282,7 +386,6 @@ class ButtonComponent(PropertyChecker):
             new_label: New label value
             selector: Optional custom selector (not used for controls)
         """
-        from framework.base import StorybookControlsManager
         controls_manager = StorybookControlsManager(self.page)
         controls_manager.update_control_via_api("main-button--button-story", "label", new_label)
         self.wait_for_animation()
@@ -291,9 +394,9 @@ class ButtonComponent(PropertyChecker):
         """
         Click on the Actions tab in Storybook panel to view action logs
         """
-        actions_tab = self.page.locator(self.locators.ACTIONS_TAB)
+        actions_tab = self.page.locator(self.locators.ACTIONS_TAB).first
         actions_tab.click()
-        self.wait_for_animation(0.3)
+        self._wait_for_animations(actions_tab)
     
     def is_actions_tab_active(self) -> bool:
         """
@@ -302,11 +405,27 @@ class ButtonComponent(PropertyChecker):
         Returns:
             True if Actions tab is active, False otherwise
         """
-        try:
-            actions_tab = self.page.locator(self.locators.ACTIONS_TAB)
-            return "tabbutton-active" in (actions_tab.get_attribute("class") or "")
-        except:
-            return False
+        # Single in-page check; a missing tab simply reads as inactive
+        return self.page.evaluate(
+            "(sel) => { const el = document.querySelector(sel); return !!el && (el.className || '').includes('tabbutton-active'); }",
+            self.locators.ACTIONS_TAB,
+        )
+    
+    def _get_cdp_session(self):
+        """
+        Lazily open a CDP session for raw Runtime.evaluate reads (Chromium only)
+        
+        Returns:
+            CDPSession, or None when the browser does not support CDP
+        """
+        if self._cdp is None:
+            self._cdp = False
+            try:
+                if self.page.context.browser.browser_type.name == "chromium":
+                    self._cdp = self.page.context.new_cdp_session(self.page)
+            except Exception as e:
+                logger.warning(f"⚠️ CDP session unavailable, using Playwright evaluate: {e}")
+        return self._cdp or None
     
     def get_action_items_from_panel(self) -> list:
         """
@@ -316,24 +435,33 @@ class ButtonComponent(PropertyChecker):
             List of action item text content
         """
         try:
+            # Read from the channel recorder when installed (no UI clicks needed)
+            recorded = self.page.evaluate(
+                "() => Array.isArray(window.__STORYBOOK_ACTIONS__) ? window.__STORYBOOK_ACTIONS__.slice() : null"
+            )
+            if recorded is not None:
+                return recorded
+            
             # Ensure Actions tab is active
             if not self.is_actions_tab_active():
                 self.click_actions_tab()
             
             # Wait for panel content to be visible
-            self.page.wait_for_selector(self.locators.ACTIONS_PANEL_CONTENT, timeout=3000)
-            
-            # Get all action items
-            action_items = self.page.locator(self.locators.ACTION_ITEMS)
-            count = action_items.count()
+            self.page.locator(self.locators.ACTIONS_PANEL_CONTENT).first.wait_for(state="visible", timeout=3000)
             
-            actions = []
-            for i in range(count):
-                item = action_items.nth(i)
-                if item.is_visible():
-                    actions.append(item.inner_text())
-            
-            return actions
+            # Collect text of all visible action items in one call
+            cdp = self._get_cdp_session()
+            if cdp is not None:
+                expression = (
+                    "Array.from(document.querySelectorAll(%s))"
+                    ".filter(e => e.offsetParent !== null).map(e => e.innerText)"
+                    % json.dumps(self.locators.ACTION_ITEMS)
+                )
+                result = cdp.send("Runtime.evaluate", {"expression": expression, "returnByValue": True})
+                return result["result"]["value"]
+            return self.page.locator(self.locators.ACTION_ITEMS).evaluate_all(
+                "els => els.filter(e => e.offsetParent !== null).map(e => e.innerText)"
+            )
         except Exception as e:
             logger.warning(f"⚠️ Error getting action items: {e}")
             return []
@@ -348,13 +476,69 @@ class ButtonComponent(PropertyChecker):
         Returns:
             Number of times the action appears in the panel
         """
+        # Count in-page: recorded channel actions if present, else visible panel items.
+        # Returns null when neither is available (Actions tab not open yet).
+        count_js = """([itemsSel, tabSel, name]) => {
+            let items = window.__STORYBOOK_ACTIONS__;
+            if (!Array.isArray(items)) {
+                const tab = document.querySelector(tabSel);
+                if (!tab || !(tab.className || '').includes('tabbutton-active')) return null;
+                items = Array.from(document.querySelectorAll(itemsSel))
+                    .filter(e => e.offsetParent !== null).map(e => e.innerText);
+            }
+            return items.filter(t => t.includes(name)).length;
+        }"""
+        js_args = [self.locators.ACTION_ITEMS, self.locators.ACTIONS_TAB, action_name]
         try:
-            actions = self.get_action_items_from_panel()
-            count = sum(1 for action in actions if action_name in action)
-            return count
-        except:
+            count = self.page.evaluate(count_js, js_args)
+            if count is None:
+                self.click_actions_tab()
+                self.page.locator(self.locators.ACTIONS_PANEL_CONTENT).first.wait_for(state="visible", timeout=3000)
+                count = self.page.evaluate(count_js, js_args)
+            return count or 0
+        except Exception as e:
+            logger.warning(f"⚠️ Error counting actions: {e}")
             return 0
     
+    def _wait_for_action_count(self, action_name: str, expected_count: int, timeout: int):
+        """
+        Wait until at least expected_count recorded/visible actions contain action_name
+        
+        Raises:
+            PlaywrightTimeoutError or AssertionError if the count is not reached within timeout (ms)
+        """
+        recording = self.page.evaluate("() => Array.isArray(window.__STORYBOOK_ACTIONS__)")
+        if recording:
+            # Channel recorder installed by clear_actions_panel: poll the recorded names in-page
+            self.page.wait_for_function(
+                "([name, n]) => window.__STORYBOOK_ACTIONS__.filter(t => t.includes(name)).length >= n",
+                arg=[action_name, expected_count],
+                timeout=timeout,
+            )
+            return
+        # Actions tab must be active so the panel items are rendered
+        if not self.is_actions_tab_active():
+            self.click_actions_tab()
+        # MutationObserver on the panel: resolves as soon as the DOM changes to reach the count,
+        # instead of re-querying on a polling interval. Gives up after timeout ms.
+        reached = self.page.evaluate(
+            """([sel, name, n, timeout]) => new Promise(resolve => {
+                const count = () => Array.from(document.querySelectorAll(sel))
+                    .filter(e => e.offsetParent !== null && (e.innerText || '').includes(name)).length;
+                if (count() >= n) return resolve(true);
+                const observer = new MutationObserver(() => {
+                    if (count() >= n) { observer.disconnect(); clearTimeout(timer); resolve(true); }
+                });
+                const timer = setTimeout(() => { observer.disconnect(); resolve(false); }, timeout);
+                observer.observe(document.body, { childList: true, subtree: true, characterData: true });
+            })""",
+            [self.locators.ACTION_ITEMS, action_name, expected_count, timeout],
+        )
+        if not reached:
+            raise AssertionError(
+                f"Expected at least {expected_count} '{action_name}' action(s) in panel within {timeout}ms"
+            )
+    
     def verify_action_in_panel(self, action_name: str, expected_count: int = 1, timeout: int = 3000) -> bool:
         """
         Verify that an action appears in the Actions panel
@@ -367,39 +551,45 @@ class ButtonComponent(PropertyChecker):
         Returns:
             True if action is found with expected count, False otherwise
         """
-        import time
-        start_time = time.time()
-        
-        # Ensure Actions tab is active
-        if not self.is_actions_tab_active():
-            self.click_actions_tab()
-        
-        while (time.time() - start_time) * 1000 < timeout:
-            try:
-                count = self.get_action_count_from_panel(action_name)
-                if count >= expected_count:
-                    return True
-            except Exception as e:
-                logger.warning(f"⚠️ Error verifying action: {e}")
-            
-            time.sleep(0.2)  # Small delay before checking again
-        
-        return False
+        try:
+            self._wait_for_action_count(action_name, expected_count, timeout)
+            return True
+        except (AssertionError, PlaywrightTimeoutError):
+            return False
     
     def clear_actions_panel(self):
         """
-        Clear all actions from the Actions panel by clicking the Clear button
+        Clear all actions from the Actions panel.
+        
+        Prefers the Storybook addons channel: installs (once per page load) a listener that
+        records action events into window.__STORYBOOK_ACTIONS__ and resets it, so later reads
+        need no UI interaction. Falls back to clicking the panel's Clear button.
         """
         try:
+            recording = self.page.evaluate("""() => {
+                const channel = window.__STORYBOOK_ADDONS_CHANNEL__;
+                if (!channel) return false;
+                if (!Array.isArray(window.__STORYBOOK_ACTIONS__)) {
+                    channel.on('storybook/actions/action-event', (action) => {
+                        const name = (action && action.data && action.data.name) || '';
+                        window.__STORYBOOK_ACTIONS__.push(name);
+                    });
+                }
+                window.__STORYBOOK_ACTIONS__ = [];
+                return true;
+            }""")
+            if recording:
+                return
+            
             # Ensure Actions tab is active
             if not self.is_actions_tab_active():
                 self.click_actions_tab()
             
             # Wait for clear button to be visible
-            clear_button = self.page.locator(self.locators.ACTION_CLEAR_BUTTON)
+            clear_button = self.page.locator(self.locators.ACTION_CLEAR_BUTTON).first
             clear_button.wait_for(state="visible", timeout=2000)
             clear_button.click()
-            self.wait_for_animation(0.3)
+            self._wait_for_animations(clear_button)
         except Exception as e:
             logger.warning(f"⚠️ Error clearing actions panel: {e}")
     
@@ -414,22 +604,8 @@ class ButtonComponent(PropertyChecker):
         Raises:
             TimeoutError if action doesn't appear within timeout
         """
-        import time
-        start_time = time.time()
-        
-        # Ensure Actions tab is active
-        if not self.is_actions_tab_active():
-            self.click_actions_tab()
-        
-        while (time.time() - start_time) * 1000 < timeout:
-            try:
-                count = self.get_action_count_from_panel(action_name)
-                if count > 0:
-                    return
-            except Exception as e:
-                pass
-            
-            time.sleep(0.2)
-        
-        raise TimeoutError(f"Action '{action_name}' did not appear in Actions panel within {timeout}ms")
+        try:
+            self._wait_for_action_count(action_name, 1, timeout)
+        except (AssertionError, PlaywrightTimeoutError):
+            raise TimeoutError(f"Action '{action_name}' did not appear in Actions panel within {timeout}ms")
 
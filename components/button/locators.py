@@ -2,6 +2,8 @@
 Locators for Button component
 All CSS selectors and locators for Button component are defined here.
 """
+import sys
+from functools import lru_cache
 
 
 class ButtonLocators:
@@ -35,20 +37,33 @@ class ButtonLocators:
     BUTTON_LOADING = "#storybook-root div button[aria-busy='true']"
     BUTTON_NOT_LOADING = "#storybook-root div button[aria-busy='false']"
     BUTTON_ACTIVE = "#storybook-root div button[data-active='true']"
+
+    # State matchers - checked against an already-resolved button via el.matches()
+    BUTTON_DISABLED_MATCHER = ":disabled, [disabled], [aria-disabled='true']"
+    BUTTON_LOADING_MATCHER = "[aria-busy='true']"
+    BUTTON_ACTIVE_MATCHER = "[data-active='true']"
     
-    @staticmethod
-    def button_by_testid(test_id: str) -> str:
+    # Pre-built selectors for the known per-variant test ids (interned, O(1) lookup)
+    _TESTID_SELECTORS = {
+        test_id: sys.intern(f"#storybook-root [data-testid='{test_id}']")
+        for test_id in ("button-primary", "button-secondary", "button-ghost", "button-link", "button-warning")
+    }
+
+    @classmethod
+    def button_by_testid(cls, test_id: str) -> str:
         """Get button locator by data-testid (e.g. 'button-primary', 'button-secondary')."""
-        return f"#storybook-root [data-testid='{test_id}']"
+        return cls._TESTID_SELECTORS.get(test_id) or f"#storybook-root [data-testid='{test_id}']"
 
     # Button with specific text
     @staticmethod
+    @lru_cache(maxsize=256)
     def button_with_text(text: str) -> str:
         """Get button locator with specific text"""
         return f"#storybook-root div button:has-text('{text}')"
     
     # Button with specific label
     @staticmethod
+    @lru_cache(maxsize=256)
     def button_by_label(label: str) -> str:
         """Get button locator by label/aria-label"""
         return f"#storybook-root div button[aria-label='{label}']"
@@ -68,6 +83,7 @@ class ButtonLocators:
     
     # Action item specific selectors
     @staticmethod
+    @lru_cache(maxsize=256)
     def action_item_by_name(action_name: str) -> str:
         """Get action item locator by action name (e.g., 'onClick')"""
         return f"#panel-tab-content li[role='treeitem']:has-text('{action_name}')"
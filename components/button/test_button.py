@@ -2,34 +2,83 @@
 Test file for Button component
 Logger is automatically injected by conftest.py - use 'logger' directly
 """
+import re
+from functools import lru_cache
+from typing import Callable
 import pytest
+# Only the constants are needed at collection time; ButtonComponent is built by the conftest fixture
 from components.button.button import (
-    ButtonComponent,
-    BUTTON_VARIANTS,
-    BUTTON_STATES,
-    BUTTON_SIZES,
+    BUTTON_STORY_PATH,
+    BUTTON_MATRIX,
     THEME_MODES,
-    BUTTON_COLOR_PROPERTIES,
 )
-from framework.base import StorybookControlsManager
 from utils.logger import logger
 
-story_path = "main-button--primary"
+story_path = BUTTON_STORY_PATH
+
+# var(--name) or var(--name, fallback)
+_VAR_RE = re.compile(r"^var\(\s*(--[\w-]+)\s*(?:,\s*(.*?))?\s*\)$")
+# Storybook controls set per variant-matrix case, in the order their values are zipped
+_CTRL_KEYS = ("variant", "disabled", "size", "loading")
+# Declared black and transparent are treated as equivalent (button.properties uses either)
+_BLACK_OR_TRANSPARENT = frozenset(("rgb(0, 0, 0)", "rgba(0, 0, 0, 0)"))
+
+
+def _norm_declared(value: str) -> tuple:
+    """Normalize a declared value to ("var", name, fallback) or ("lit", value)."""
+    value = value.strip()
+    m = _VAR_RE.match(value)
+    if m:
+        return ("var", m.group(1), m.group(2))
+    return ("lit", value)
+
+
+@lru_cache(maxsize=None)
+def _declared_matcher(expected_val: str) -> Callable[[str], bool]:
+    """Build (once per expected value) a predicate for declared_matches."""
+    e = _norm_declared(expected_val)
+    if e[0] == "var":
+        if e[2] is None:
+            # Same var name; actual may add a fallback
+            return lambda actual: _norm_declared(actual)[:2] == e[:2]
+        return lambda actual: _norm_declared(actual) == e
+    if e[1] in _BLACK_OR_TRANSPARENT:
+        return lambda actual: actual.strip() in _BLACK_OR_TRANSPARENT
+    return lambda actual: actual.strip() == e[1]
+
+
+def declared_matches(expected_val: str, actual: str) -> bool:
+    """Declared-style comparison: same var name (actual may add a fallback) or equal literals."""
+    return _declared_matcher(expected_val)(actual)
 
 
 @pytest.mark.property
 class TestButtonComponent:
     """Test suite for Button component"""
 
-    @pytest.fixture(scope="class")
-    def button(self, page):
-        """Fixture to create ButtonComponent instance and navigate to story"""
-        button = ButtonComponent(page)
-        try:
+    @pytest.fixture(autouse=True)
+    def restore_default_story(self, request, button):
+        """
+        Reload the default story only if a previous test left it dirty. Storybook mirrors changed
+        controls/globals into the URL, so a clean story URL means args are still at defaults.
+        Tests using the theme fixture manage story state themselves.
+        """
+        if "theme" not in request.fixturenames and not button.page.url.endswith(f"/story/{story_path}"):
             button.navigate_to_story(story_path, wait_for_selector=button.locators.BUTTON)
-        except Exception:
-            button.navigate_to_story(story_path, wait_for_selector="body")
-        return button
+
+    @pytest.fixture(
+        scope="class",
+        params=[pytest.param(t, marks=pytest.mark.xdist_group(name=f"theme-{t}")) for t in THEME_MODES],
+    )
+    def theme(self, request, button):
+        """
+        Theme mode, loaded once per value: class scope makes pytest group the matrix by theme,
+        so the story reloads |THEME_MODES| times instead of once per combination.
+        Under xdist --dist loadgroup each theme's cases run on a single worker.
+        """
+        theme = request.param
+        button.navigate_to_story(story_path, theme_mode=theme, wait_for_selector=button.locators.BUTTON)
+        return theme
     
     def test_button_click(self, button):
         """Test clicking a button and verify onClick action was triggered"""
@@ -48,45 +97,17 @@ class TestButtonComponent:
         initial_count = button.get_action_count_from_panel("onClick")
         logger.info(f"Initial onClick action count: {initial_count}")
         
+        # click_button waits for transitions; verify_action_in_panel waits for the action
         button.click_button()
-        button.wait_for_animation(0.5)
         
-        # Verify onClick action was triggered in Storybook Actions panel
-        try:
-            button.wait_for_action_in_panel("onClick", timeout=3000)
-            
-            # Verify action count increased
-            final_count = button.get_action_count_from_panel("onClick")
-            assert final_count > initial_count, \
-                f"onClick action count should increase from {initial_count} to at least {initial_count + 1}, got {final_count}"
-            
-            logger.info(f"✅ Button clicked successfully - onClick action verified in Storybook Actions panel")
-            logger.info(f"  Action count: {initial_count} → {final_count}")
-        except TimeoutError:
-            # Fallback: try the old method
-            action_triggered = button.verify_storybook_action("onClick", expected_count=initial_count + 1, timeout=2000)
-            if action_triggered:
-                logger.info("✅ Button clicked successfully - onClick action verified (fallback method)")
-            else:
-                # Verify action count increased as fallback verification
-                final_count = button.get_action_count_from_panel("onClick")
-                assert final_count > initial_count, \
-                    f"onClick action was not triggered. Action count did not increase from {initial_count}, got {final_count}"
-                logger.info(f"✅ Button clicked successfully - action count increased: {initial_count} → {final_count}")
-        except Exception as e:
-            # Last resort: check if action count increased
-            final_count = button.get_action_count_from_panel("onClick")
-            if final_count <= initial_count:
-                raise AssertionError(
-                    f"Button click did not trigger onClick action. "
-                    f"Action count did not increase from {initial_count}, got {final_count}. "
-                    f"Original error: {e}"
-                )
-            logger.info(f"✅ Button clicked successfully - action count increased: {initial_count} → {final_count}")
+        # Verify onClick action was triggered in Storybook Actions panel (single bounded wait)
+        expected_count = initial_count + 1
+        assert button.verify_action_in_panel("onClick", expected_count=expected_count, timeout=3000), \
+            f"onClick action was not triggered: expected at least {expected_count} in Actions panel within 3000ms"
+        logger.info("✅ Button clicked successfully - onClick action verified in Storybook Actions panel")
         
-    def test_button_text(self):
+    def test_button_text(self, button):
         """Test getting button text"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Get button text
         text = button.get_button_text()
@@ -95,17 +116,15 @@ class TestButtonComponent:
         # Verify text is not empty
         assert text == "Hello World", f"Button text should be 'Hello World', got '{text}'"
  
-    def test_button_enabled_state(self):
+    def test_button_enabled_state(self, button):
         """Test button enabled/disabled state"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Verify button is enabled
         button.verify_button_enabled()
         logger.info("✅ Button is enabled")
     
-    def test_button_disabled_state(self):
+    def test_button_disabled_state(self, button, controls_manager):
         """Test button disabled state"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Update button to disabled state via controls
         controls_manager.update_control_via_api(story_path, "disabled", True)
@@ -114,9 +133,8 @@ class TestButtonComponent:
         button.verify_button_disabled()
         logger.info("✅ Button is disabled")
     
-    def test_button_properties(self):
+    def test_button_properties(self, button):
         """Test button regular CSS properties (excluding CSS variables)"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         button.verify_component_properties(selector=button.locators.BUTTON)
         logger.info("✅ Button regular properties verified")
@@ -142,9 +160,8 @@ class TestButtonComponent:
             if value.startswith("var("):
                 logger.info("   (variable reference: %s)", value)
     
-    def test_button_label_update(self):
+    def test_button_label_update(self, button):
         """Test updating button label via Storybook controls"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Update label
         new_label = "Updated Button Label"
@@ -156,9 +173,8 @@ class TestButtonComponent:
             f"Button label should be '{new_label}'"
         logger.info(f"✅ Button label updated to: {new_label}")
     
-    def test_button_variant(self):
+    def test_button_variant(self, button, controls_manager):
         """Test button variant"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Update variant via controls
         controls_manager.update_control_via_api(story_path, "variant", "primary")
@@ -167,9 +183,8 @@ class TestButtonComponent:
         button.verify_button_variant("primary")
         logger.info("✅ Button variant verified")
     
-    def test_update_single_control(self):
+    def test_update_single_control(self, button, controls_manager):
         """Test updating a single control value"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         logger.info(f"\n{'='*60}")
         logger.info(f"Starting test: test_update_single_control")
@@ -196,9 +211,8 @@ class TestButtonComponent:
             traceback.print_exc()
             raise
     
-    def test_update_multiple_controls(self):
+    def test_update_multiple_controls(self, button, controls_manager):
         """Test updating multiple controls at once"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Update multiple controls
         controls_manager.update_multiple_controls(story_path, {
@@ -213,9 +227,8 @@ class TestButtonComponent:
         assert all_values.get("disabled") == False
         logger.info("✅ Multiple controls updated successfully")
     
-    def test_get_control_value(self):
+    def test_get_control_value(self, button, controls_manager):
         """Test getting a control value"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Get a control value
         # Adjust control name based on your component
@@ -223,9 +236,8 @@ class TestButtonComponent:
         assert value is not None, "Control value should not be None"
         logger.info(f"✅ Control value retrieved: {value}")
     
-    def test_get_all_control_values(self):
+    def test_get_all_control_values(self, button, controls_manager):
         """Test getting all control values"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Get all control values
         all_values = controls_manager.get_all_control_values(story_path)
@@ -233,9 +245,8 @@ class TestButtonComponent:
         assert len(all_values) > 0, "Should have at least one control"
         logger.info(f"✅ Retrieved {len(all_values)} control values")
     
-    def test_update_control_types(self):
+    def test_update_control_types(self, button, controls_manager):
         """Test updating different control types"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Test string control
         controls_manager.update_control_via_api(story_path, "children", "Test String")
@@ -252,9 +263,8 @@ class TestButtonComponent:
         # assert controls_manager.get_control_value(story_path, "count") == 42
         logger.info("✅ Different control types updated successfully")
     
-    def test_reset_controls(self):
+    def test_reset_controls(self, button, controls_manager):
         """Test resetting controls to defaults"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Get initial values
         initial_values = controls_manager.get_all_control_values(story_path)
@@ -275,9 +285,8 @@ class TestButtonComponent:
         assert reset_values is not None
         logger.info("✅ Controls reset to defaults")
     
-    def test_control_updates_reflect_in_component(self):
+    def test_control_updates_reflect_in_component(self, button, controls_manager):
         """Test that control updates are reflected in the component"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Update label control
         new_label = "Dynamic Label"
@@ -291,9 +300,8 @@ class TestButtonComponent:
         assert new_label in button_text, f"Component should show '{new_label}', got '{button_text}'"
         logger.info(f"✅ Component updated with new label: {new_label}")
     
-    def test_controls_with_complex_values(self):
+    def test_controls_with_complex_values(self, button, controls_manager):
         """Test updating controls with complex values (objects, arrays)"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Test array control (if available in your Button component)
         # controls_manager.update_control_via_api(story_path, "items", ["item1", "item2", "item3"])
@@ -313,9 +321,8 @@ class TestButtonComponent:
         
         logger.info("✅ Complex values test (commented out - adjust based on your Button component args)")
     
-    def test_button_hover(self):
+    def test_button_hover(self, button):
         """Test hovering over button"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Hover over button
         button.hover_button()
@@ -323,9 +330,8 @@ class TestButtonComponent:
         # Verify hover state (add specific verification if needed)
         logger.info("✅ Button hovered successfully")
     
-    def test_button_click_by_text(self):
+    def test_button_click_by_text(self, button):
         """Test clicking button by its text"""
-        button, story_path, controls_manager = self.button, self.story_path, self.controls_manager
         
         # Get button text first
         button_text = button.get_button_text()
@@ -334,27 +340,23 @@ class TestButtonComponent:
         button.click_button_by_text(button_text)
         logger.info(f"✅ Button clicked by text: {button_text}")
 
-    # Runs one test per combination: BUTTON_VARIANTS × BUTTON_STATES × BUTTON_SIZES × THEME_MODES.
-    # One page load per combination; verifies all properties (computed) and color declared styles together.
-    @pytest.mark.parametrize("variant", BUTTON_VARIANTS)
-    @pytest.mark.parametrize("state", BUTTON_STATES)
-    @pytest.mark.parametrize("size", BUTTON_SIZES)
-    @pytest.mark.parametrize("theme", THEME_MODES)
+    # Runs one test per combination: BUTTON_MATRIX (variant × state × size) × THEME_MODES.
+    # The class-scoped theme fixture reloads the story once per theme; within a theme the
+    # controls are updated in place. Verifies all properties (computed) and color declared styles together.
+    @pytest.mark.parametrize("variant,state,size", BUTTON_MATRIX, ids=["-".join(case) for case in BUTTON_MATRIX])
     def test_button_variant_properties(
         self, button, controls_manager, variant: str, state: str, size: str, theme: str
     ):
-        """Set Storybook controls for variant/state/size, navigate with theme; verify all CSS properties and color declared styles in one go."""
-        button.navigate_to_story(
-            story_path, theme_mode=theme, wait_for_selector=button.locators.BUTTON
-        )
-
-        controls = {
-            "variant": variant,
-            "disabled": state == "disabled",
-            "size": size,
-            "loading": state == "loading",
-        }
-        controls_manager.update_multiple_controls(story_path, controls, button.locators.BUTTON)
+        """Set variant/state/size controls on the themed story (in place, else via URL args); verify all CSS properties and color declared styles in one go."""
+        controls = dict(zip(_CTRL_KEYS, (variant, state == "disabled", size, state == "loading")))
+        if button.update_story_args(story_path, controls):
+            button.wait_for_component_ready(button.locators.BUTTON)
+            # The page is not reloaded, so drop hover/focus left on the button by a previous case
+            button.reset_interaction_state()
+        else:
+            controls_manager.navigate_to_story_with_args(
+                story_path, controls, theme_mode=theme, wait_for_selector=button.locators.BUTTON
+            )
 
         expected = button.load_button_variant_properties(variant, state, size)
         if not expected:
@@ -364,24 +366,11 @@ class TestButtonComponent:
 
         expected_colors = button.load_button_variant_color_properties(variant, state, size)
 
-        def declared_matches(expected_val: str, actual: str) -> bool:
-            e, a = expected_val.strip(), actual.strip()
-            if e == a:
-                return True
-            if e.startswith("var(--") and a.startswith("var(--"):
-                evar = e.rstrip(")").rstrip()
-                if a == evar + ")" or a.startswith(evar + ","):
-                    return True
-            if e == "rgb(0, 0, 0)" and a == "rgba(0, 0, 0, 0)":
-                return True
-            if a == "rgb(0, 0, 0)" and e == "rgba(0, 0, 0, 0)":
-                return True
-            return False
-
         def assert_declared_color_styles():
             mismatches = []
+            declared = button.get_declared_styles_bulk(button.locators.BUTTON, list(expected_colors))
             for prop_name, expected_value in expected_colors.items():
-                actual_declared = button.get_declared_style(button.locators.BUTTON, prop_name)
+                actual_declared = declared[prop_name]
                 if not declared_matches(expected_value, actual_declared):
                     mismatches.append(
                         f"{prop_name}: expected {expected_value!r}, got {actual_declared!r}"
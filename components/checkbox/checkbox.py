@@ -6,6 +6,9 @@ from typing import Optional
 from framework.base import PropertyChecker
 from components.checkbox.locators import CheckboxLocators
 
+# Default Checkbox story; the session-wide checkbox fixture (conftest.py) starts here
+CHECKBOX_STORY_PATH = "main-checkbox--default"
+
 
 class CheckboxComponent(PropertyChecker):
     """
@@ -25,21 +28,22 @@ class CheckboxComponent(PropertyChecker):
         """Click checkbox to toggle state"""
         checkbox = self.get_checkbox(selector)
         checkbox.click()
-        self.wait_for_animation()
+        self._wait_for_animations(checkbox)
+        self.clear_declared_style_cache()
     
     def check_checkbox(self, selector: Optional[str] = None):
         """Check the checkbox (set to checked)"""
         checkbox = self.get_checkbox(selector)
-        if not checkbox.is_checked():
-            checkbox.check()
-        self.wait_for_animation()
+        # check() is a no-op when already checked and verifies the resulting state itself
+        checkbox.check()
+        self._wait_for_animations(checkbox)
     
     def uncheck_checkbox(self, selector: Optional[str] = None):
         """Uncheck the checkbox (set to unchecked)"""
         checkbox = self.get_checkbox(selector)
-        if checkbox.is_checked():
-            checkbox.uncheck()
-        self.wait_for_animation()
+        # uncheck() is a no-op when already unchecked and verifies the resulting state itself
+        checkbox.uncheck()
+        self._wait_for_animations(checkbox)
     
     def is_checked(self, selector: Optional[str] = None) -> bool:
         """Check if checkbox is checked"""
@@ -75,18 +79,16 @@ class CheckboxComponent(PropertyChecker):
         """Hover over the checkbox"""
         checkbox = self.get_checkbox(selector)
         checkbox.hover()
-        self.wait_for_animation(0.3)
+        self._wait_for_animations(checkbox)
+        self.clear_declared_style_cache()
     
     def get_checkbox_label(self, selector: Optional[str] = None) -> Optional[str]:
-        """Get checkbox label text"""
-        checkbox = self.get_checkbox(selector)
-        # Try to find associated label
-        checkbox_id = checkbox.get_attribute("id")
-        if checkbox_id:
-            # Use iframe frame locator to find label
-            frame = self.get_iframe_frame_locator()
-            label = frame.locator(f"label[for='{checkbox_id}']")
-            if label.count() > 0:
-                return label.first.inner_text()
-        return None
-
+        """Get checkbox label text (label[for=<checkbox id>], else a wrapping <label>, else the parent's text) in one evaluate; None if empty"""
+        return self._evaluate_in_story(
+            selector or self.locators.CHECKBOX,
+            """if (!el) return null;
+            const label = (el.id && doc.querySelector('label[for="' + CSS.escape(el.id) + '"]'))
+                || el.closest('label') || el.parentElement;
+            const text = label ? (label.innerText || '').trim() : '';
+            return text || null;""",
+        )
@@ -2,6 +2,7 @@
 Locators for Main Tab component
 All CSS selectors and locators for Main Tab component are defined here
 """
+from functools import lru_cache
 
 
 class MainTabLocators:
@@ -11,28 +12,57 @@ class MainTabLocators:
     TAB_CONTAINER = "#storybook-root div"
     TABS_WRAPPER = "#storybook-root [role='tablist'], #storybook-root .tabs, #storybook-root [class*='tab']"
     
+    # Multi-branch selectors are kept as priority-ordered tuples (most specific first);
+    # the comma-joined strings below are derived from them. MainTabComponent narrows to
+    # the first branch that matches in the current story (see _narrow_selector, tab_selector,
+    # active_tab_selector and inactive_tab_selector); the joined unions are only meant for waits before the story has loaded.
+    TAB_SELECTORS = (
+        "#storybook-root [role='tab']",
+        "#storybook-root button[class*='tab']",
+        "#storybook-root [class*='tab-item']",
+    )
+    TAB_ACTIVE_SELECTORS = (
+        "#storybook-root [role='tab'][aria-selected='true']",
+        "#storybook-root [class*='tab'][class*='active']",
+        "#storybook-root button[aria-selected='true']",
+    )
+    # Inactive counterparts of TAB_SELECTORS (a bare [class*='tab'] would also match tablist/containers)
+    TAB_INACTIVE_SELECTORS = (
+        "#storybook-root [role='tab'][aria-selected='false']",
+        "#storybook-root button[class*='tab']:not([class*='active'])",
+        "#storybook-root [class*='tab-item']:not([class*='active'])",
+    )
+    TAB_INDICATOR_SELECTORS = (
+        "#storybook-root [class*='indicator']",
+        "#storybook-root [class*='underline']",
+        "#storybook-root ::after",
+    )
+    
     # Individual tab selectors
-    TAB = "#storybook-root [role='tab'], #storybook-root button[class*='tab'], #storybook-root [class*='tab-item']"
+    TAB = ", ".join(TAB_SELECTORS)
     TAB_BUTTON = "#storybook-root button[role='tab']"
     
     # Tab states
-    TAB_ACTIVE = "#storybook-root [role='tab'][aria-selected='true'], #storybook-root [class*='tab'][class*='active'], #storybook-root button[aria-selected='true']"
-    TAB_INACTIVE = "#storybook-root [role='tab'][aria-selected='false'], #storybook-root [class*='tab']:not([class*='active'])"
+    TAB_ACTIVE = ", ".join(TAB_ACTIVE_SELECTORS)
+    TAB_INACTIVE = ", ".join(TAB_INACTIVE_SELECTORS)
     
+    # Selector builders are memoized: tests call them in per-tab loops with repeating arguments
     # Tab with specific text
     @staticmethod
+    @lru_cache(maxsize=64)
     def tab_with_text(text: str) -> str:
         """Get tab locator with specific text"""
         return f"#storybook-root [role='tab']:has-text('{text}'), #storybook-root button:has-text('{text}')"
     
     # Tab by index
     @staticmethod
+    @lru_cache(maxsize=32)
     def tab_by_index(index: int) -> str:
         """Get tab locator by index (0-based)"""
         return f"#storybook-root [role='tab']:nth-of-type({index + 1}), #storybook-root button[role='tab']:nth-of-type({index + 1})"
     
     # Tab indicator/underline (for active state)
-    TAB_INDICATOR = "#storybook-root [class*='indicator'], #storybook-root [class*='underline'], #storybook-root ::after"
+    TAB_INDICATOR = ", ".join(TAB_INDICATOR_SELECTORS)
     
     # Tab content/panel
     TAB_PANEL = "#storybook-root [role='tabpanel'], #storybook-root [class*='tab-panel'], #storybook-root [class*='tab-content']"
@@ -1,18 +1,40 @@
 """
 Main Tab component class with all Main Tab-specific functions
 """
+from functools import cached_property
 from playwright.sync_api import Page, Locator
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Any
 from framework.base import PropertyChecker
 from components.main_tab.locators import MainTabLocators
 from utils.logger import logger
 
+# Default Main Tab story; the session-wide main_tab fixture (conftest.py) starts here
+MAIN_TAB_STORY_PATH = "main-tab--default"
+
 
 class MainTabComponent(PropertyChecker):
     """
     Main Tab component class with all Main Tab-specific functionality
     """
     
+    # _evaluate_in_story body fragment: el = active tab, args[1] = indicator selectors.
+    # Sets indicatorColor to the first non-transparent of: indicator element background,
+    # active tab border-bottom, active tab ::after background / border-bottom.
+    _INDICATOR_COLOR_JS = """const visible = c => c && c !== 'rgba(0, 0, 0, 0)' && c !== 'transparent';
+        const cands = [];
+        for (const sel of args[1]) {
+            let indicator = null;
+            try { indicator = doc.querySelector(sel); } catch (_) {}
+            if (indicator) { cands.push(window.getComputedStyle(indicator).backgroundColor); break; }
+        }
+        if (el) {
+            const own = window.getComputedStyle(el);
+            const after = window.getComputedStyle(el, '::after');
+            cands.push(own.borderBottomColor, after.backgroundColor, after.borderBottomColor);
+        }
+        const indicatorColor = cands.find(visible) || null;
+        """
+    
     def __init__(self, page: Page, storybook_url: str = None):
         """
         Initialize Main Tab component
@@ -23,6 +45,60 @@ class MainTabComponent(PropertyChecker):
         """
         super().__init__(page, storybook_url)
         self.locators = MainTabLocators()
+        # (page URL, branch tuple) -> first matching branch; see _narrow_selector
+        self._narrowed: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        # (page URL, per-tab entries) from snapshot_tabs; reset by click/hover
+        self._tab_snapshot: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+        # (page URL, probe dict) from probe_active_tab; reset together with the snapshot
+        self._active_probe: Optional[Tuple[str, Dict[str, Any]]] = None
+    
+    def _narrow_selector(self, branches: Tuple[str, ...]) -> str:
+        """
+        Resolve a priority-ordered selector tuple to its first branch that matches in the story,
+        probing all branches in one evaluate. Cached per page URL; until something matches, the
+        full comma-joined selector is returned (and nothing is cached).
+        
+        Args:
+            branches: Priority-ordered CSS selectors (e.g. MainTabLocators.TAB_SELECTORS)
+            
+        Returns:
+            The single matching branch, or all branches joined with ', '
+        """
+        key = (self.page.url, branches)
+        narrowed = self._narrowed.get(key)
+        if narrowed is not None:
+            return narrowed
+        index = self.page.evaluate(
+            """(sels) => {
+                const iframe = document.querySelector('iframe');
+                const doc = iframe && iframe.contentDocument;
+                if (!doc) return -1;
+                for (let i = 0; i < sels.length; i++) {
+                    try { if (doc.querySelector(sels[i])) return i; } catch (_) {}
+                }
+                return -1;
+            }""",
+            list(branches),
+        )
+        if index is None or index < 0:
+            return ", ".join(branches)
+        self._narrowed[key] = branches[index]
+        return branches[index]
+    
+    @property
+    def tab_selector(self) -> str:
+        """TAB narrowed to the branch used by the current story (use instead of locators.TAB)"""
+        return self._narrow_selector(self.locators.TAB_SELECTORS)
+    
+    @property
+    def active_tab_selector(self) -> str:
+        """TAB_ACTIVE narrowed to the branch used by the current story (use instead of locators.TAB_ACTIVE)"""
+        return self._narrow_selector(self.locators.TAB_ACTIVE_SELECTORS)
+    
+    @property
+    def inactive_tab_selector(self) -> str:
+        """TAB_INACTIVE narrowed to the branch used by the current story (use instead of locators.TAB_INACTIVE)"""
+        return self._narrow_selector(self.locators.TAB_INACTIVE_SELECTORS)
     
     def get_tab(self, selector: Optional[str] = None) -> Locator:
         """
@@ -34,11 +110,14 @@ class MainTabComponent(PropertyChecker):
         Returns:
             Tab locator (first match if multiple tabs found)
         """
-        return self.get_story_locator(selector or self.locators.TAB)
+        if selector is None:
+            return self.tab_locator
+        return self.get_story_locator(selector)
     
     def get_tab_by_text(self, text: str) -> Locator:
         """
-        Get tab locator by text content
+        Get tab locator by text content: role=tab by accessible name, or the CSS
+        :has-text fallback for tabs rendered without the tab role
         
         Args:
             text: Text content of the tab
@@ -46,8 +125,9 @@ class MainTabComponent(PropertyChecker):
         Returns:
             Tab locator matching the text
         """
-        selector = self.locators.tab_with_text(text)
-        return self.get_story_locator(selector)
+        frame = self.get_story_frame_locator()
+        by_role = frame.get_by_role("tab", name=text)
+        return by_role.or_(frame.locator(self.locators.tab_with_text(text))).first
     
     def get_tab_by_index(self, index: int) -> Locator:
         """
@@ -62,16 +142,83 @@ class MainTabComponent(PropertyChecker):
         selector = self.locators.tab_by_index(index)
         return self.get_story_locator(selector)
     
+    # cached_property locators below; dropped on navigation so narrowing is redone for the new story
+    _CACHED_LOCATORS = ("tab_locator", "active_tab_locator", "inactive_tab_locator")
+    
+    @cached_property
+    def tab_locator(self) -> Locator:
+        """First tab (narrowed TAB selector)"""
+        return self.get_story_locator(self.tab_selector)
+    
+    @cached_property
+    def active_tab_locator(self) -> Locator:
+        """First active tab (narrowed TAB_ACTIVE selector)"""
+        return self.get_story_locator(self.active_tab_selector)
+    
+    @cached_property
+    def inactive_tab_locator(self) -> Locator:
+        """First inactive tab (narrowed TAB_INACTIVE selector)"""
+        return self.get_story_locator(self.inactive_tab_selector)
+    
+    def navigate_to_story(self, *args, **kwargs):
+        """Navigate (see StorybookBase.navigate_to_story); the reload resets tab state, so drop cached tab reads and locators."""
+        self._invalidate_tab_state()
+        for name in self._CACHED_LOCATORS:
+            self.__dict__.pop(name, None)
+        return super().navigate_to_story(*args, **kwargs)
+    
+    def _wait_for_tab_animations(self, tab: Locator):
+        """
+        Wait until finite CSS animations/transitions in the story document finish (the active
+        indicator usually animates outside the tab's own subtree); returns immediately if none.
+        
+        Args:
+            tab: Tab locator that was just clicked or hovered
+        """
+        self._wait_for_animations(tab, document_wide=True)
+    
+    def snapshot_tabs(self) -> List[Dict[str, Any]]:
+        """
+        Read text and active state of every tab in one evaluate_all call.
+        Cached per page URL until the next click/hover on a tab.
+        
+        Returns:
+            One dict per tab in document order: text, ariaSelected, className, active
+        """
+        url = self.page.url
+        if self._tab_snapshot is not None and self._tab_snapshot[0] == url:
+            return self._tab_snapshot[1]
+        tabs_locator = self.get_story_frame_locator().locator(self.tab_selector)
+        entries = tabs_locator.evaluate_all(
+            """els => els.map(e => {
+                const className = e.getAttribute('class') || '';
+                const ariaSelected = e.getAttribute('aria-selected');
+                return {
+                    text: (e.innerText || '').trim(),
+                    ariaSelected,
+                    className,
+                    active: ariaSelected === 'true' || className.toLowerCase().includes('active'),
+                };
+            })"""
+        )
+        self._tab_snapshot = (url, entries)
+        return entries
+    
+    def _invalidate_tab_state(self):
+        """Drop the cached snapshot_tabs/probe_active_tab results (tab state may have changed)"""
+        self._tab_snapshot = None
+        self._active_probe = None
+    
     def get_all_tabs(self) -> List[Locator]:
         """
-        Get all tab locators
+        Get all tab locators (same order as snapshot_tabs)
         
         Returns:
             List of all tab locators
         """
-        tabs_locator = self.get_story_locators(self.locators.TAB)
-        count = tabs_locator.count()
-        return [tabs_locator.nth(i) for i in range(count)]
+        tabs_locator = self.get_story_frame_locator().locator(self.tab_selector)
+        nth = tabs_locator.nth
+        return [nth(i) for i in range(len(self.snapshot_tabs()))]
     
     def click_tab(self, selector: Optional[str] = None):
         """
@@ -82,7 +229,8 @@ class MainTabComponent(PropertyChecker):
         """
         tab = self.get_tab(selector)
         tab.click()
-        self.wait_for_animation()
+        self._invalidate_tab_state()
+        self._wait_for_tab_animations(tab)
     
     def click_tab_by_text(self, text: str):
         """
@@ -93,7 +241,8 @@ class MainTabComponent(PropertyChecker):
         """
         tab = self.get_tab_by_text(text)
         tab.click()
-        self.wait_for_animation()
+        self._invalidate_tab_state()
+        self._wait_for_tab_animations(tab)
     
     def click_tab_by_index(self, index: int):
         """
@@ -104,7 +253,8 @@ class MainTabComponent(PropertyChecker):
         """
         tab = self.get_tab_by_index(index)
         tab.click()
-        self.wait_for_animation()
+        self._invalidate_tab_state()
+        self._wait_for_tab_animations(tab)
     
     def is_tab_active(self, selector: Optional[str] = None) -> bool:
         """
@@ -117,17 +267,15 @@ class MainTabComponent(PropertyChecker):
             True if tab is active, False otherwise
         """
         try:
+            if selector is None:
+                tabs = self.snapshot_tabs()
+                return bool(tabs) and tabs[0]["active"]
             tab = self.get_tab(selector)
-            aria_selected = tab.get_attribute("aria-selected")
-            if aria_selected == "true":
-                return True
-            
-            # Check for active class
-            class_name = tab.get_attribute("class") or ""
-            if "active" in class_name.lower():
-                return True
-            
-            return False
+            # aria-selected="true" or an "active" class, checked in one round-trip
+            return bool(tab.evaluate(
+                "el => el.getAttribute('aria-selected') === 'true'"
+                " || (el.getAttribute('class') || '').toLowerCase().includes('active')"
+            ))
         except Exception as e:
             logger.warning(f"Error checking tab active state: {e}")
             return False
@@ -154,8 +302,13 @@ class MainTabComponent(PropertyChecker):
         Returns:
             Tab text content
         """
+        if selector is None:
+            tabs = self.snapshot_tabs()
+            if tabs:
+                return tabs[0]["text"]
         tab = self.get_tab(selector)
-        return tab.inner_text().strip()
+        # Trimmed in-page, like snapshot_tabs
+        return tab.evaluate("el => (el.innerText || '').trim()")
     
     def get_active_tab_text(self) -> Optional[str]:
         """
@@ -165,10 +318,8 @@ class MainTabComponent(PropertyChecker):
             Text of active tab, or None if no active tab found
         """
         try:
-            active_tab = self.get_story_locator(self.locators.TAB_ACTIVE)
-            if active_tab.count() > 0:
-                return active_tab.first.inner_text().strip()
-            return None
+            # No separate count() round-trip: a missing active tab times out quickly instead
+            return self.active_tab_locator.inner_text(timeout=1000).strip()
         except Exception:
             return None
     
@@ -179,8 +330,7 @@ class MainTabComponent(PropertyChecker):
         Returns:
             Number of tabs
         """
-        tabs = self.get_story_locator(self.locators.TAB)
-        return tabs.count()
+        return len(self.snapshot_tabs())
     
     def verify_tab_active(self, selector: Optional[str] = None):
         """
@@ -217,7 +367,8 @@ class MainTabComponent(PropertyChecker):
         """
         tab = self.get_tab(selector)
         tab.hover()
-        self.wait_for_animation(0.3)
+        self._invalidate_tab_state()
+        self._wait_for_tab_animations(tab)
     
     def hover_tab_by_text(self, text: str):
         """
@@ -228,7 +379,8 @@ class MainTabComponent(PropertyChecker):
         """
         tab = self.get_tab_by_text(text)
         tab.hover()
-        self.wait_for_animation(0.3)
+        self._invalidate_tab_state()
+        self._wait_for_tab_animations(tab)
     
     def get_tab_color(self, selector: Optional[str] = None) -> str:
         """
@@ -245,39 +397,53 @@ class MainTabComponent(PropertyChecker):
     
     def get_tab_indicator_color(self) -> Optional[str]:
         """
-        Get color of the active tab indicator/underline
+        Get color of the active tab indicator/underline.
+        Candidates, in order: indicator element background, active tab border-bottom,
+        active tab ::after background / border-bottom. All are read in one evaluate.
         
         Returns:
-            RGB color value of indicator, or None if not found
+            First non-transparent candidate color, or None if not found
         """
         try:
-            # Try to find indicator element
-            indicator = self.get_story_locator(self.locators.TAB_INDICATOR)
-            if indicator.count() > 0:
-                return indicator.first.evaluate("el => window.getComputedStyle(el).backgroundColor")
-            
-            # Fallback: check active tab's border-bottom or ::after pseudo-element
-            active_tab = self.get_story_locator(self.locators.TAB_ACTIVE)
-            if active_tab.count() > 0:
-                # Try border-bottom color
-                border_color = active_tab.first.evaluate(
-                    "el => window.getComputedStyle(el).borderBottomColor"
-                )
-                if border_color and border_color != "rgba(0, 0, 0, 0)":
-                    return border_color
-                
-                # Try ::after pseudo-element
-                after_color = active_tab.first.evaluate(
-                    "el => { const after = window.getComputedStyle(el, '::after'); return after.backgroundColor || after.borderBottomColor; }"
-                )
-                if after_color:
-                    return after_color
-            
-            return None
+            return self._evaluate_in_story(
+                self.active_tab_selector,
+                self._INDICATOR_COLOR_JS + "return indicatorColor;",
+                list(self.locators.TAB_INDICATOR_SELECTORS),
+            )
         except Exception as e:
             logger.warning(f"Error getting tab indicator color: {e}")
             return None
     
+    def probe_active_tab(self) -> Dict[str, Any]:
+        """
+        Read active-tab facts in one evaluate. Cached per page URL until the next click/hover.
+        
+        Returns:
+            Dict with count (active tabs), inactiveCount, indicatorColor (see
+            get_tab_indicator_color), and textColor/classes of the first active tab (None if none)
+        """
+        url = self.page.url
+        if self._active_probe is not None and self._active_probe[0] == url:
+            return self._active_probe[1]
+        probe = self._evaluate_in_story(
+            self.active_tab_selector,
+            self._INDICATOR_COLOR_JS + """const count = sel => { try { return doc.querySelectorAll(sel).length; } catch (_) { return 0; } };
+            return {
+                count: count(args[0]),
+                inactiveCount: count(args[2]),
+                textColor: el ? window.getComputedStyle(el).color : null,
+                indicatorColor,
+                classes: el ? (el.getAttribute('class') || '') : null,
+            };""",
+            list(self.locators.TAB_INDICATOR_SELECTORS),
+            self.inactive_tab_selector,
+        )
+        if probe is None:
+            # Story iframe not loaded yet - do not cache
+            return {"count": 0, "inactiveCount": 0, "textColor": None, "indicatorColor": None, "classes": None}
+        self._active_probe = (url, probe)
+        return probe
+    
     def verify_active_tab_has_indicator(self):
         """
         Verify that the active tab has a visible indicator (underline/border)
@@ -285,11 +451,12 @@ class MainTabComponent(PropertyChecker):
         Raises:
             AssertionError: If active tab doesn't have indicator
         """
-        active_tab = self.get_story_locator(self.locators.TAB_ACTIVE)
-        assert active_tab.count() > 0, "No active tab found"
+        # Active-tab existence and indicator color come from the same (cached) probe
+        probe = self.probe_active_tab()
+        assert probe["count"] > 0, "No active tab found"
         
         # Check for indicator element or border
-        indicator_color = self.get_tab_indicator_color()
+        indicator_color = probe["indicatorColor"]
         assert indicator_color is not None and indicator_color != "rgba(0, 0, 0, 0)", \
             "Active tab should have a visible indicator"
         logger.info(f"✅ Active tab has indicator with color: {indicator_color}")
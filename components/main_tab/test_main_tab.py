@@ -3,63 +3,49 @@ Test file for Main Tab component
 Logger is automatically injected by conftest.py - use 'logger' directly
 """
 import pytest
-from components.main_tab.main_tab import MainTabComponent
-from framework.base import StorybookControlsManager
+from playwright.sync_api import expect
+from components.main_tab.main_tab import MAIN_TAB_STORY_PATH
 from utils.logger import logger
 
-STORY_PATH = "main-tab--default"
+STORY_PATH = MAIN_TAB_STORY_PATH
 
 
 @pytest.mark.property
 class TestMainTabComponent:
     """Test suite for Main Tab component"""
     
-    @pytest.fixture(scope="class")
-    def main_tab(self, page):
-        """Fixture to create MainTabComponent instance and navigate to story"""
-        main_tab = MainTabComponent(page)
-        main_tab.navigate_to_story(STORY_PATH, wait_for_selector=main_tab.locators.TAB)
-        return main_tab
-    
-    @pytest.fixture(scope="class")
-    def controls_manager(self, page):
-        """Fixture to create StorybookControlsManager instance"""
-        return StorybookControlsManager(page)
+    @pytest.fixture(autouse=True)
+    def restore_story(self, main_tab):
+        """
+        Reload the story only if the shared page is elsewhere (another suite navigated away)
+        or a previous test left changed controls in the URL.
+        """
+        if not main_tab.page.url.endswith(f"/story/{STORY_PATH}"):
+            main_tab.navigate_to_story(STORY_PATH, wait_for_selector=main_tab.locators.TAB)
     
-    @pytest.fixture(scope="class", autouse=True)
-    def setup_class_fixtures(self, main_tab, controls_manager):
-        """Automatically store fixtures as instance attributes"""
-        self.main_tab = main_tab
-        self.story_path = STORY_PATH
-        self.controls_manager = controls_manager
-        yield
+    @pytest.fixture
+    def active_tab_probe(self, main_tab):
+        """Active-tab count, colors and classes from one evaluate (cached on main_tab until a click/hover)"""
+        return main_tab.probe_active_tab()
     
-    def test_tab_count(self):
+    def test_tab_count(self, main_tab):
         """Test that there are tabs present"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
         tab_count = main_tab.get_tab_count()
         assert tab_count > 0, f"Expected at least one tab, got {tab_count}"
         logger.info(f"✅ Found {tab_count} tabs")
     
-    def test_active_tab_has_indicator(self):
+    def test_active_tab_has_indicator(self, main_tab):
         """Test that active tab has a visible indicator (green underline per Figma design)"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
         # Verify active tab has indicator
         main_tab.verify_active_tab_has_indicator()
         logger.info("✅ Active tab has indicator")
     
-    def test_active_tab_text_color(self):
+    def test_active_tab_text_color(self, active_tab_probe):
         """Test that active tab has dark gray text color (#333333 per Figma design)"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
-        # Get active tab
-        active_tab = main_tab.get_story_locator(main_tab.locators.TAB_ACTIVE)
-        assert active_tab.count() > 0, "No active tab found"
+        assert active_tab_probe["count"] > 0, "No active tab found"
         
         # Get text color
-        color = main_tab.get_tab_color(main_tab.locators.TAB_ACTIVE)
+        color = active_tab_probe["textColor"]
         logger.info(f"Active tab text color: {color}")
         
         # Verify it's a dark color (should be close to #333333 or rgb(51, 51, 51))
@@ -67,48 +53,39 @@ class TestMainTabComponent:
         assert color is not None, "Active tab should have a text color"
         logger.info("✅ Active tab has dark text color")
     
-    def test_inactive_tab_text_color(self):
+    def test_inactive_tab_text_color(self, main_tab):
         """Test that inactive tabs have light gray text color (#999999 per Figma design)"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
-        # Get inactive tabs
-        inactive_tabs = main_tab.get_story_locator(main_tab.locators.TAB_INACTIVE)
-        assert inactive_tabs.count() > 0, "No inactive tabs found"
+        # Web-first check: retries until an inactive tab is attached, no separate count()
+        inactive_tab = main_tab.inactive_tab_locator
+        expect(inactive_tab, "No inactive tabs found").to_be_attached(timeout=2000)
         
         # Get text color of first inactive tab
-        color = main_tab.get_tab_color(main_tab.locators.TAB_INACTIVE)
+        color = main_tab.get_tab_color(main_tab.inactive_tab_selector)
         logger.info(f"Inactive tab text color: {color}")
         
         # Verify it's a light color (should be close to #999999)
         assert color is not None, "Inactive tab should have a text color"
         logger.info("✅ Inactive tab has light text color")
     
-    def test_tab_click(self):
+    def test_tab_click(self, main_tab):
         """Test clicking on a tab"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
+        # Text/active state of all tabs in one round-trip
+        tabs = main_tab.snapshot_tabs()
+        assert len(tabs) > 1, "Need at least 2 tabs to test clicking"
         
-        # Get initial active tab text
-        initial_active = main_tab.get_active_tab_text()
+        # Initial active tab, for the log only - taken from the snapshot, no extra round-trip
+        initial_active = next((tab["text"] for tab in tabs if tab["active"]), None)
         logger.info(f"Initial active tab: {initial_active}")
         
-        # Get all tabs
-        tabs = main_tab.get_all_tabs()
-        assert len(tabs) > 1, "Need at least 2 tabs to test clicking"
-        
         # Find a tab that's not currently active
-        target_tab_index = None
-        for i, tab in enumerate(tabs):
-            if not main_tab.is_tab_active(main_tab.locators.tab_by_index(i)):
-                target_tab_index = i
-                break
+        target_tab_index = next((i for i, tab in enumerate(tabs) if not tab["active"]), None)
         
         if target_tab_index is not None:
             # Click the inactive tab
-            target_tab_text = main_tab.get_tab_text(main_tab.locators.tab_by_index(target_tab_index))
+            target_tab_text = tabs[target_tab_index]["text"]
             logger.info(f"Clicking tab: {target_tab_text}")
             
             main_tab.click_tab_by_index(target_tab_index)
-            main_tab.wait_for_animation(0.5)
             
             # Verify the clicked tab is now active
             main_tab.verify_tab_active(main_tab.locators.tab_by_index(target_tab_index))
@@ -116,16 +93,13 @@ class TestMainTabComponent:
         else:
             logger.warning("⚠️ All tabs are active, skipping click test")
     
-    def test_tab_hover_state(self):
+    def test_tab_hover_state(self, main_tab):
         """Test hovering over a tab (should show green border per Figma design)"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
         # Get an inactive tab to hover
-        inactive_tabs = main_tab.get_story_locator(main_tab.locators.TAB_INACTIVE)
+        inactive_tabs = main_tab.inactive_tab_locator
         if inactive_tabs.count() > 0:
             # Hover over first inactive tab
-            main_tab.hover_tab(main_tab.locators.TAB_INACTIVE)
-            main_tab.wait_for_animation(0.3)
+            main_tab.hover_tab(main_tab.inactive_tab_selector)
             
             # Check if hover state is visible (border or outline)
             hovered_tab = inactive_tabs.first
@@ -148,41 +122,36 @@ class TestMainTabComponent:
         else:
             logger.warning("⚠️ No inactive tabs found for hover test")
     
-    def test_tab_states(self):
+    def test_tab_states(self, active_tab_probe):
         """Test that tabs have correct active/inactive states"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
         # Verify at least one tab is active
-        active_tabs = main_tab.get_story_locator(main_tab.locators.TAB_ACTIVE)
-        assert active_tabs.count() > 0, "At least one tab should be active"
-        logger.info(f"✅ Found {active_tabs.count()} active tab(s)")
+        active_count = active_tab_probe["count"]
+        assert active_count > 0, "At least one tab should be active"
+        logger.info(f"✅ Found {active_count} active tab(s)")
         
         # Verify inactive tabs exist
-        inactive_tabs = main_tab.get_story_locator(main_tab.locators.TAB_INACTIVE)
-        if inactive_tabs.count() > 0:
-            logger.info(f"✅ Found {inactive_tabs.count()} inactive tab(s)")
+        inactive_count = active_tab_probe["inactiveCount"]
+        if inactive_count > 0:
+            logger.info(f"✅ Found {inactive_count} inactive tab(s)")
         else:
             logger.info("ℹ️ All tabs are active (single tab scenario)")
     
-    def test_tab_text_content(self):
+    def test_tab_text_content(self, main_tab):
         """Test that tabs have text content"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
-        tabs = main_tab.get_all_tabs()
+        # All tab texts (already trimmed in-page) in one round-trip
+        tabs = main_tab.snapshot_tabs()
         assert len(tabs) > 0, "No tabs found"
         
         for i, tab in enumerate(tabs):
-            text = main_tab.get_tab_text(main_tab.locators.tab_by_index(i))
-            assert text and len(text.strip()) > 0, f"Tab {i} should have text content"
+            text = tab["text"]
+            assert text, f"Tab {i} should have text content"
             logger.info(f"Tab {i} text: '{text}'")
         
         logger.info("✅ All tabs have text content")
     
-    def test_tab_indicator_color(self):
+    def test_tab_indicator_color(self, active_tab_probe):
         """Test that active tab indicator has green color (#66CC33 per Figma design)"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
-        indicator_color = main_tab.get_tab_indicator_color()
+        indicator_color = active_tab_probe["indicatorColor"]
         if indicator_color:
             logger.info(f"Tab indicator color: {indicator_color}")
             # Verify it's not transparent/black
@@ -192,18 +161,14 @@ class TestMainTabComponent:
         else:
             logger.warning("⚠️ Could not detect indicator color (may need to check DOM structure)")
     
-    def test_tab_properties(self):
+    def test_tab_properties(self, main_tab):
         """Test tab regular CSS properties (excluding CSS variables)"""
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
-        main_tab.verify_component_properties(selector=main_tab.locators.TAB)
+        main_tab.verify_component_properties(selector=main_tab.tab_selector)
         logger.info("✅ Tab regular properties verified")
     
-    def test_tab_css_variables(self):
+    def test_tab_css_variables(self, main_tab):
         """
         Verifies all CSS variables available in browser match css-variables.properties.
         """
-        main_tab, story_path, controls_manager = self.main_tab, self.story_path, self.controls_manager
-        
         main_tab.get_all_css_variables_from_root()
         logger.info("✅ Tab CSS variable properties verified")
@@ -36,16 +36,28 @@ class TestThemePalette:
 
     @pytest.fixture(scope="class")
     def component(self, page):
-        return _ThemePaletteTester(page)
-
-    @pytest.mark.parametrize("theme_mode", THEME_MODES, ids=THEME_MODES)
+        """Load the story once per class; each mode is then switched in place (set_theme_mode)."""
+        tester = _ThemePaletteTester(page)
+        tester.navigate_to_story(STORY_PATH, wait_for_selector="body")
+        return tester
+
+    # One xdist group per mode: under `make test-parallel` (--dist loadgroup) the modes can
+    # run on separate workers; in a serial run they share one story load (see component)
+    @pytest.mark.parametrize(
+        "theme_mode",
+        [pytest.param(m, marks=pytest.mark.xdist_group(name=f"theme-palette-{m}")) for m in THEME_MODES],
+        ids=THEME_MODES,
+    )
     def test_theme_palette_css_variables(self, component, theme_mode):
         """
-        For the given theme mode, navigate with globals.themeMode=<mode>,
-        then verify :root CSS variables against colors-<mode>.properties.
+        For the given theme mode, switch globals.themeMode=<mode> on the loaded story
+        (falling back to navigating with it), then verify :root CSS variables against
+        colors-<mode>.properties.
         """
         component._css_properties_file = _COMP_DIR / f"colors-{theme_mode}.properties"
         logger.info("Theme mode: %s → verifying against %s", theme_mode, component._css_properties_file.name)
-        component.navigate_to_story(STORY_PATH, theme_mode=theme_mode, wait_for_selector="body")
+        on_story = f"/story/{STORY_PATH}" in component.page.url
+        if not (on_story and component.set_theme_mode(theme_mode)):
+            component.navigate_to_story(STORY_PATH, theme_mode=theme_mode, wait_for_selector="body")
         component.verify_all_css_variables(story_path=STORY_PATH, selector="body")
         logger.info("Theme palette variables verified for mode: %s", theme_mode)
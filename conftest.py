@@ -2,27 +2,147 @@
 Pytest fixtures for Storybook testing
 Root-level conftest.py - makes fixtures available to all tests in tests/ and components/
 """
+from __future__ import annotations
+
+import atexit
+import importlib
 import pytest
 import logging
 import os
+import queue
+import re
 import shutil
-from playwright.sync_api import Page, Browser, BrowserContext
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 from framework.framework_settings import (
     LOGS_DIR,
     SCREENSHOTS_DIR,
 )
 
-# Prevent pytest-playwright from auto-loading its fixtures
-# We use our own custom browser fixture to avoid conflicts
-pytest_plugins = []  # Empty list prevents auto-loading
+# pytest-playwright is still loaded through its entry point; the session-scoped browser,
+# browser_context and page fixtures below override its function-scoped ones of the same name
+# (pytest.ini blanks its browser options). Launch/context options use its extension-point names:
+# browser_type_launch_args and browser_context_args.
+pytest_plugins = []
 
 # Load configuration from INI file
 from framework.config_loader import get_config
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    # Type hints only: the Playwright client is imported when the browser is launched
+    # (playwright_instance), not when pytest loads this conftest
+    from playwright.sync_api import Page
+
 config = get_config()
 
+# URLs blocked for every page (CDP Network.setBlockedURLs wildcards, used under Chromium):
+# source maps, audio/video, and analytics/telemetry beacons
+BLOCKED_REQUEST_PATTERNS = (
+    "*.map",
+    "*.mp4",
+    "*.webm",
+    "*.ogg",
+    "*.mp3",
+    "*.wav",
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+)
+# The same set as Playwright route patterns, for Firefox/WebKit (no CDP); see the page fixture
+BLOCKED_ROUTE_PATTERNS = (
+    "**/*.map",
+    "**/*.{mp4,webm,ogg,mp3,wav}",
+    re.compile(r"^https?://([^/]+\.)?(google-analytics|googletagmanager|doubleclick)\.[a-z.]+/"),
+)
+
+# new_context options for the shared session context (see browser_context_args)
+BROWSER_CONTEXT_ARGS = MappingProxyType({
+    "viewport": {
+        "width": config.VIEWPORT_WIDTH,
+        "height": config.VIEWPORT_HEIGHT,
+    },
+    "ignore_https_errors": True,
+})
+
+# Chromium launch flags: window size, plus no /dev/shm reliance (small in CI containers) and no
+# background services the tests never use. Sandbox and site isolation are left on.
+CHROMIUM_ARGS = (
+    "--start-maximized",
+    "--window-size=1920,1080",
+    "--disable-dev-shm-usage",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-breakpad",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-features=TranslateUI",
+    "--disable-ipc-flooding-protection",
+)
+
+# Tester kind -> (module, class) for the tester factory and the named tester fixtures
+TESTER_CLASSES = {
+    "storybook": ("framework.base", "StorybookBase"),
+    "visual": ("framework.base", "VisualRegressionBase"),
+    "interaction": ("framework.base", "InteractionBase"),
+    "state": ("framework.base", "StateBase"),
+    "snapshot": ("framework.snapshot", "SnapshotTester"),
+    "property": ("framework.base", "PropertyChecker"),
+}
+
+
+def _make_tester(kind: str, page: Page):
+    """Instantiate the tester class for kind on page, importing its module lazily."""
+    module_name, class_name = TESTER_CLASSES[kind]
+    return getattr(importlib.import_module(module_name), class_name)(page)
+
+
+# Node id -> filesystem-safe name: one C-level pass instead of chained str.replace calls
+_SANITIZE = str.maketrans({"/": "_", "\\": "_", ":": "_"})
+
+
+def _test_name(item) -> str:
+    """Sanitized test name for artifacts and logs, computed once and stashed on the item."""
+    name = getattr(item, "_test_name", None)
+    if name is None:
+        name = item._test_name = item.nodeid.translate(_SANITIZE)
+    return name
+
+
+# Request types logged by the opt-in request listener (see page)
+_LOGGED_RESOURCE_TYPES = frozenset({"document", "xhr", "fetch"})
+
+
+def pytest_addoption(parser):
+    """
+    Opt-in browser event logging (see page fixture; also settable in commonui.properties)
+    and full-page failure screenshots (see pytest_runtest_makereport).
+    Args:
+      - parser (pytest.Parser): Command-line option parser.
+    """
+    group = parser.getgroup("commonui")
+    group.addoption(
+        "--verbose-browser",
+        action="store_true",
+        default=False,
+        help="Log browser console messages and document/XHR/fetch requests (DEBUG level)",
+    )
+    group.addoption(
+        "--log-http-errors",
+        action="store_true",
+        default=False,
+        help="Log HTTP responses with status >= 400",
+    )
+    group.addoption(
+        "--full-screenshot",
+        action="store_true",
+        default=False,
+        help="Capture full-page PNG failure screenshots instead of viewport JPEGs",
+    )
+
 
 def pytest_collection_modifyitems(config, items):
     """
@@ -30,24 +150,21 @@ def pytest_collection_modifyitems(config, items):
     Test files can use 'logger' directly without importing it.
     This runs after modules are imported, so we inject logger into existing modules.
     """
-    # Track which modules we've already injected logger into
-    injected_modules = set()
-    
-    for item in items:
-        # Get the module for this test item
-        test_module = item.module
-        if test_module and test_module not in injected_modules:
-            # Inject logger into the module's namespace
-            # This works because Python modules are mutable
-            if not hasattr(test_module, 'logger'):
-                test_module.logger = logger
-            injected_modules.add(test_module)
+    # One setdefault per distinct test module (modules that import logger keep their own)
+    for test_module in {getattr(item, "module", None) for item in items} - {None}:
+        test_module.__dict__.setdefault("logger", logger)
 
 
 @pytest.fixture(scope="session", autouse=True)
 def configure_logging_once():
+    """Initialize project-wide logging (once per session; see _configure_logging)."""
+    _configure_logging()
+
+
+def _configure_logging():
     """
-    Initialize project-wide logging (once per session).
+    Attach the file/console handlers to the 'commonui' logger; later calls are no-ops.
+    Called from pytest_sessionstart (controller) and configure_logging_once (every process).
     Files:
     - reports/logs/test_execution_log_<worker>.log (master in serial; gwN in xdist)
     """
@@ -57,21 +174,17 @@ def configure_logging_once():
     worker_id = os.getenv("PYTEST_XDIST_WORKER") or "master"
     log_file = logs_dir / f"test_execution_log_{worker_id}.log"
 
-    # Fresh file each run (safe with per-worker filename)
-    try:
-        if log_file.exists():
-            log_file.unlink()
-    except Exception:
-        pass
-
     logger = logging.getLogger("commonui")
     if getattr(logger, "_configured", False):
         return
 
     fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 
-    # File handler (overwrite)
-    fh = logging.FileHandler(str(log_file), encoding="utf-8", mode="w")
+    # File handler: previous runs' logs and backups are already removed by pytest_sessionstart, so this
+    # opens a fresh file (lazily, on the first record) and rotates if a run grows past 50 MB
+    fh = RotatingFileHandler(
+        str(log_file), maxBytes=50_000_000, backupCount=2, encoding="utf-8", delay=True
+    )
     fh.setLevel(logging.INFO)
     fh.setFormatter(fmt)
 
@@ -80,61 +193,87 @@ def configure_logging_once():
     sh.setLevel(logging.INFO)
     sh.setFormatter(fmt)
 
+    # Tests only enqueue records; a background listener thread does the file/console writes.
+    # Stopped (and drained) at interpreter exit, after pytest's last report hooks have logged.
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, fh, sh, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
     logger.setLevel(logging.INFO)
-    logger.addHandler(fh)
-    logger.addHandler(sh)
+    logger.addHandler(QueueHandler(log_queue))
     logger.propagate = False
     logger._configured = True
 
     logger.info(f"📝 Logging to: {log_file}")
 
 
-@pytest.fixture(scope="session", autouse=True)
-def cleanup_reports_before_session():
+def _remove_dirs(dirs):
+    """Delete directory trees, ignoring errors (runs in a background thread)."""
+    for d in dirs:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def pytest_sessionstart(session):
     """
     Clean old screenshots and logs before the test session starts.
-    Args: None
-    Yields: None
+    Runs once, in the controller (or the only process when not using xdist), before any
+    worker opens its log file or writes screenshots - so parallel workers never delete
+    each other's artifacts.
+    Args:
+      - session (pytest.Session): Test session object.
     """
+    if hasattr(session.config, "workerinput"):
+        return
+
+    # Remove previous run logs (master + gwN, rotated .log.N backups included) so each run starts fresh.
+    # Done before logging is configured, so the file handler never has one of these files open;
+    # the outcome is logged once the handlers exist.
+    removed_logs, failed_logs = [], []
+    logs_dir = Path(LOGS_DIR)
+    if logs_dir.exists():
+        for p in logs_dir.glob("test_execution_log*.log*"):
+            try:
+                p.unlink()
+                removed_logs.append(p)
+            except Exception as e:
+                failed_logs.append((p, e))
+
+    # Hooks run before session fixtures: without handlers the INFO records below would be dropped
+    _configure_logging()
+    for p in removed_logs:
+        logger.info(f"🗑️ Removed old log: {p}")
+    for p, e in failed_logs:
+        logger.warning(f"⚠️ Could not remove log {p}: {e}")
+
     # Reset screenshots folder
     folders = [
         Path(SCREENSHOTS_DIR),
     ]
 
     for folder in folders:
-        if folder.exists():
-            logger.info(f"🧹 Cleaning up old {folder.name} before test run (recursive)...")
+        # Rename is O(1); the old tree is deleted in a daemon thread while tests start.
+        # The sweep below globs every <folder>.old.* - the tree just moved aside plus any left
+        # by earlier runs that exited before their deletion finished.
+        if folder.exists() and any(folder.iterdir()):
+            logger.info(f"🧹 Cleaning up old {folder.name} before test run (background)...")
+            stale = folder.with_name(f"{folder.name}.old.{os.getpid()}")
             try:
-                shutil.rmtree(folder)
-                logger.info(f"   🗑️ Removed: {folder}")
+                folder.rename(stale)
+                logger.info(f"   🗑️ Moved aside for removal: {stale}")
             except Exception as e:
-                logger.warning(f"   ⚠️ Could not remove {folder}: {e}")
+                logger.warning(f"   ⚠️ Could not move {folder} aside: {e}")
+        leftovers = list(folder.parent.glob(f"{folder.name}.old.*"))
+        if leftovers:
+            threading.Thread(target=_remove_dirs, args=(leftovers,), daemon=True).start()
         folder.mkdir(parents=True, exist_ok=True)
-        logger.info(f"📁 Created fresh folder: {folder}")
-
-    # Remove previous run logs (master + gwN) to avoid stale content in parallel runs
-    logs_dir = Path(LOGS_DIR)
-    if logs_dir.exists():
-        for p in logs_dir.glob("test_execution_log*.log"):
-            try:
-                p.unlink()
-                logger.info(f"🗑️ Removed old log: {p}")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not remove log {p}: {e}")
-
-    yield
+        logger.info(f"📁 Fresh folder ready: {folder}")
 
 
 @pytest.fixture(scope="session")
 def browser_context_args():
-    """Browser context arguments"""
-    return {
-        "viewport": {
-            "width": config.VIEWPORT_WIDTH,
-            "height": config.VIEWPORT_HEIGHT,
-        },
-        "ignore_https_errors": True,
-    }
+    """Browser context arguments (read-only; consumed by browser_context)"""
+    return BROWSER_CONTEXT_ARGS
 
 
 @pytest.fixture(scope="session")
@@ -147,19 +286,14 @@ def playwright_instance():
 
 
 @pytest.fixture(scope="session")
-def browser(playwright_instance):
+def browser_type_launch_args():
     """
-    Create a browser instance per test function.
-    Args:
-      - playwright_instance: Session-scoped Playwright handle.
-      - request (pytest.FixtureRequest): Access to CLI opts (e.g., --headed).
-    Yields:
-      - browser: Playwright Browser instance.
+    Launch options for the configured browser type (same extension point name as
+    pytest-playwright's fixture, so overriding it in a sub-conftest works the same way).
+    Returns:
+      - dict: kwargs for BrowserType.launch.
     """
-
-    browser_name = config.BROWSER
     is_headless = config.HEADLESS
-    browser_type = getattr(playwright_instance, browser_name)
     
     # Launch arguments
     launch_args = {
@@ -171,63 +305,166 @@ def browser(playwright_instance):
         launch_args["slow_mo"] = 250
     
     # Add launch arguments for Chromium
-    if browser_name == "chromium":
-        launch_args["args"] = ["--start-maximized", "--window-size=1920,1080"]
+    if config.BROWSER == "chromium":
+        launch_args["args"] = list(CHROMIUM_ARGS)
+    
+    return launch_args
+
+
+@pytest.fixture(scope="session")
+def browser(playwright_instance, browser_type_launch_args):
+    """
+    Launch the configured browser once per session (once per worker under xdist).
+    Args:
+      - playwright_instance: Session-scoped Playwright handle.
+      - browser_type_launch_args (dict): kwargs for BrowserType.launch.
+    Yields:
+      - browser: Playwright Browser instance.
+    """
+
+    browser_name = config.BROWSER
+    browser_type = getattr(playwright_instance, browser_name)
     
     logger.info(f"Launching {browser_name} browser...")
-    logger.info(f"Headless mode: {is_headless}")
+    logger.info(f"Headless mode: {browser_type_launch_args['headless']}")
     
-    browser = browser_type.launch(**launch_args)
+    browser = browser_type.launch(**browser_type_launch_args)
     
     yield browser
     
     browser.close()
     
 @pytest.fixture(scope="session")
-def page(browser, request):
-    """Page fixture for test execution"""
-    
-    # Create browser context with viewport settings
+def browser_context(browser, browser_context_args):
+    """
+    Session-scoped browser context shared by all pages.
+    Under pytest-xdist each worker has its own session, so this is one context per worker.
+    Args:
+      - browser: Session-scoped Playwright Browser instance.
+      - browser_context_args: Viewport/HTTPS options for new_context.
+    Yields:
+      - context: Playwright BrowserContext instance.
+    """
+    storage_state = config.STORAGE_STATE
     context = browser.new_context(
-        viewport={
-            "width": config.VIEWPORT_WIDTH,
-            "height": config.VIEWPORT_HEIGHT,
-        },
-        ignore_https_errors=True,
+        **browser_context_args,
+        storage_state=str(storage_state) if storage_state and storage_state.exists() else None,
     )
+    # Fail fast on locator misses instead of Playwright's 30s default;
+    # calls that need longer (e.g. navigate_to_story) pass an explicit timeout
+    context.set_default_timeout(5000)
+    context.set_default_navigation_timeout(10000)
+    # Tracing is opt-in; per-test chunks are written only for failures (see trace_on_failure)
+    if config.TRACE_ON_FAILURE:
+        context.tracing.start(screenshots=False, snapshots=True)
     
-    page = context.new_page()
+    yield context
     
-    # Store for hooks
-    test_name = request.node.nodeid.replace("/", "_").replace("\\", "_").replace(":", "_")
-    request.node._test_name = test_name
-    request.node._browser_context = context
-    request.node._page = page
+    if config.TRACE_ON_FAILURE:
+        context.tracing.stop()
     
-    logger.info(f"▶ TEST START: {test_name}")
-    
-    # Add console logging to see what's happening
-    def handle_console(msg):
-        logger.debug(f"Browser Console: {msg.type} - {msg.text}")
-    page.on("console", handle_console)
+    # Persist Storybook's localStorage for the next run (one writer under xdist)
+    if storage_state and os.getenv("PYTEST_XDIST_WORKER") in (None, "gw0"):
+        try:
+            context.storage_state(path=str(storage_state))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save storage state to {storage_state}: {e}")
+    context.close()
+
+
+@pytest.fixture(autouse=True)
+def trace_on_failure(request):
+    """
+    Record one trace chunk per browser test (one using the page) when browser.trace_on_failure is
+    enabled; the chunk is saved next to the failure screenshots only if the test failed, otherwise discarded.
+    Args:
+      - request (pytest.FixtureRequest): Current test request.
+    Yields:
+      - None
+    """
+    # fixturenames is the full closure, so component fixtures (button, main_tab, ...) count as using the page;
+    # tests without a browser must not launch one just to record an empty trace
+    if not config.TRACE_ON_FAILURE or "page" not in request.fixturenames:
+        yield
+        return
+
+    context = request.getfixturevalue("browser_context")
+    context.tracing.start_chunk(title=request.node.nodeid)
+    yield
+    reports = (getattr(request.node, f"_rep_{when}", None) for when in ("setup", "call"))
+    failed = any(rep is not None and rep.failed for rep in reports)
+    if failed:
+        test_name = _test_name(request.node)
+        trace_path = Path(SCREENSHOTS_DIR) / f"{test_name}_trace.zip"
+        context.tracing.stop_chunk(path=str(trace_path))
+        logger.info(f"🧵 Trace saved: {trace_path}")
+    else:
+        context.tracing.stop_chunk()
+
+
+@pytest.fixture(scope="session")
+def page(browser_context, pytestconfig):
+    """
+    Session-wide page in the shared context. The component fixtures (button, checkbox, main_tab)
+    keep a story loaded on it across tests, so it is neither closed nor recreated per test;
+    per-test bookkeeping lives in track_test.
+    """
+    page = browser_context.new_page()
     
-    # Add page error logging
+    # Page errors are rare, so always logged
     def handle_page_error(error):
         logger.error(f"Page Error: {error}")
     page.on("pageerror", handle_page_error)
     
-    # Add request/response logging (only errors to reduce noise)
-    def handle_request(request):
-        if request.resource_type in ["document", "xhr", "fetch"]:
-            logger.debug(f"Request: {request.method} {request.url}")
-    def handle_response(response):
-        if response.status >= 400:
-            logger.warning(f"Response Error: {response.status} {response.url}")
-    page.on("request", handle_request)
-    page.on("response", handle_response)
+    # Skip downloads the assertions never look at. Fonts are kept: widths/line-heights depend on them.
+    # Chromium blocks in the browser via CDP, which leaves the HTTP cache on. Firefox/WebKit have no
+    # CDP, so they fall back to page.route with URL-specific patterns (no "**/*" handler); any route
+    # disables the HTTP cache for the page, so the Storybook bundles are refetched per navigation there.
+    if config.BROWSER == "chromium":
+        cdp = browser_context.new_cdp_session(page)
+        cdp.send("Network.enable")
+        cdp.send("Network.setBlockedURLs", {"urls": list(BLOCKED_REQUEST_PATTERNS)})
+    else:
+        for pattern in BLOCKED_ROUTE_PATTERNS:
+            page.route(pattern, lambda route: route.abort())
+    
+    # Console/request/response listeners fire for every message and asset, each one a driver
+    # event dispatched into Python - register them only when asked for
+    if pytestconfig.getoption("verbose_browser") or config.VERBOSE_BROWSER_LOGS:
+        def handle_console(msg):
+            logger.debug(f"Browser Console: {msg.type} - {msg.text}")
+        def handle_request(request):
+            if request.resource_type in _LOGGED_RESOURCE_TYPES:
+                logger.debug(f"Request: {request.method} {request.url}")
+        page.on("console", handle_console)
+        page.on("request", handle_request)
+    
+    if pytestconfig.getoption("log_http_errors") or config.LOG_HTTP_ERRORS:
+        def handle_response(response):
+            if response.status >= 400:
+                logger.warning(f"Response Error: {response.status} {response.url}")
+        page.on("response", handle_response)
     
     yield page
     
+    page.close()
+
+
+@pytest.fixture(autouse=True)
+def track_test(request):
+    """
+    Log test start/end and stash the test name (and the shared page, when the test uses it)
+    on the item for pytest_runtest_makereport's failure screenshot.
+    Args:
+      - request (pytest.FixtureRequest): Current test request.
+    Yields:
+      - None
+    """
+    test_name = _test_name(request.node)
+    if "page" in request.fixturenames:
+        request.node._page = request.getfixturevalue("page")
+    logger.info(f"▶ TEST START: {test_name}")
+    yield
     logger.info(f"⏹ TEST END: {test_name}")
 
 
@@ -241,51 +478,97 @@ def logger_fixture():
     return logger
 
 
+@pytest.fixture(scope="function")
+def tester(page: Page):
+    """
+    Tester factory on the shared page: tester("visual") -> VisualRegressionBase(page), etc.
+    Kinds are the keys of TESTER_CLASSES; each class is imported on first request.
+    """
+    return lambda kind: _make_tester(kind, page)
+
+
 @pytest.fixture(scope="function")
 def storybook_base(page: Page):
     """Storybook base fixture"""
-    from framework.base import StorybookBase
-    return StorybookBase(page)
+    return _make_tester("storybook", page)
 
 
 @pytest.fixture(scope="function")
 def visual_tester(page: Page):
     """Visual regression tester fixture"""
-    from framework.base import VisualRegressionBase
-    return VisualRegressionBase(page)
+    return _make_tester("visual", page)
 
 
 @pytest.fixture(scope="function")
 def interaction_tester(page: Page):
     """Interaction tester fixture"""
-    from framework.base import InteractionBase
-    return InteractionBase(page)
+    return _make_tester("interaction", page)
 
 
 @pytest.fixture(scope="function")
 def state_tester(page: Page):
     """State tester fixture"""
-    from framework.base import StateBase
-    return StateBase(page)
+    return _make_tester("state", page)
 
 
 @pytest.fixture(scope="function")
 def snapshot_tester(page: Page):
     """Snapshot tester fixture"""
-    from framework.snapshot import SnapshotTester
-    return SnapshotTester(page)
+    return _make_tester("snapshot", page)
 
 
 @pytest.fixture(scope="function")
 def property_checker(page: Page):
     """Property checker fixture"""
-    from framework.base import PropertyChecker
-    return PropertyChecker(page)
+    return _make_tester("property", page)
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
+def button(page: Page):
+    """
+    Session-wide ButtonComponent, navigated to the default Button story once.
+    Tests that change controls are restored by the button suite's reset fixture.
+    """
+    from components.button.button import ButtonComponent, BUTTON_STORY_PATH
+    button = ButtonComponent(page)
+    try:
+        button.navigate_to_story(BUTTON_STORY_PATH, wait_for_selector=button.locators.BUTTON)
+    except Exception:
+        button.navigate_to_story(BUTTON_STORY_PATH, wait_for_selector="body")
+    return button
+
+
+@pytest.fixture(scope="session")
+def checkbox(page: Page):
+    """
+    Session-wide CheckboxComponent, navigated to the default Checkbox story once.
+    Tests that change controls are restored by the checkbox suite's reset fixture.
+    """
+    from components.checkbox.checkbox import CheckboxComponent, CHECKBOX_STORY_PATH
+    checkbox = CheckboxComponent(page)
+    checkbox.navigate_to_story(CHECKBOX_STORY_PATH, wait_for_selector=None)
+    # Native input or role=checkbox, whichever renders - one wait instead of two sequential ones
+    frame = checkbox.get_story_frame_locator()
+    ready = frame.locator(checkbox.locators.CHECKBOX).or_(frame.locator(checkbox.locators.CHECKBOX_BY_ROLE))
+    ready.first.wait_for(state="visible", timeout=10000)
+    return checkbox
+
+
+@pytest.fixture(scope="session")
+def main_tab(page: Page):
+    """
+    Session-wide MainTabComponent, navigated to the default Main Tab story once.
+    The main tab suite re-navigates only when the page has left the story.
+    """
+    from components.main_tab.main_tab import MainTabComponent, MAIN_TAB_STORY_PATH
+    main_tab = MainTabComponent(page)
+    main_tab.navigate_to_story(MAIN_TAB_STORY_PATH, wait_for_selector=main_tab.locators.TAB)
+    return main_tab
+
+
+@pytest.fixture(scope="session")
 def controls_manager(page: Page):
-    """Storybook controls manager fixture"""
+    """Storybook controls manager fixture (stateless apart from per-page caches, so shared)"""
     from framework.base import StorybookControlsManager
     return StorybookControlsManager(page)
 
@@ -293,7 +576,8 @@ def controls_manager(page: Page):
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
 def pytest_runtest_makereport(item, call):
     """
-    Attach screenshot artifacts on test failure and close browser context after each test call.
+    Attach screenshot artifacts on test failure. The shared session context/page stay open
+    (browser_context and page close them at session end).
     Args:
       - item (pytest.Item): Test node object.
       - call (CallInfo): Call outcome info injected by pytest.
@@ -302,42 +586,34 @@ def pytest_runtest_makereport(item, call):
     """
     outcome = yield
     report = outcome.get_result()
+    # Expose the phase report to fixture teardown (used by trace_on_failure)
+    setattr(item, f"_rep_{report.when}", report)
     
-    test_name = getattr(item, "_test_name", item.nodeid.replace(":", "_").replace("/", "_").replace("\\", "_"))
-    context = getattr(item, '_browser_context', None)
+    test_name = _test_name(item)
     page_obj = getattr(item, '_page', None)
 
     screenshots_root = Path(SCREENSHOTS_DIR)
 
-    # Attach screenshot on failure (BEFORE closing context)
+    # Attach screenshot on failure
     if report.failed and page_obj:
         try:
             # Check if page is still valid
             if not page_obj.is_closed():
                 screenshots_root.mkdir(parents=True, exist_ok=True)
-                screenshot_path = screenshots_root / f"{test_name}_failure_{report.when}.png"
-                
-                # Take screenshot with full_page option
-                page_obj.screenshot(path=str(screenshot_path), full_page=True)
-                
-                # Verify screenshot was created and has content
-                if screenshot_path.exists() and screenshot_path.stat().st_size > 0:
-                    logger.info(f"📸 Screenshot saved: {screenshot_path}")
+                if item.config.getoption("full_screenshot"):
+                    # Whole scroll height, lossless (slow on long pages; debugging only)
+                    screenshot_path = screenshots_root / f"{test_name}_failure_{report.when}.png"
+                    page_obj.screenshot(path=str(screenshot_path), full_page=True)
                 else:
-                    logger.warning(f"⚠️ Screenshot file is empty or doesn't exist: {screenshot_path}")
+                    # Viewport-sized JPEG is enough for triage; bounded so teardown never hangs on it
+                    screenshot_path = screenshots_root / f"{test_name}_failure_{report.when}.jpg"
+                    page_obj.screenshot(path=str(screenshot_path), type="jpeg", quality=70, timeout=3000)
+                
+                # Playwright raises if the capture fails, so the file exists here
+                logger.info(f"📸 Screenshot saved: {screenshot_path}")
             else:
                 logger.warning(f"⚠️ Page is closed, cannot take screenshot for {test_name}")
         except Exception as e:
             logger.error(f"❌ Screenshot capture failed for {test_name}: {e}")
             import traceback
             logger.debug(traceback.format_exc())
-
-    # Close context after test (only for call phase)
-    if report.when == "call" and context:
-        try:
-            context.close()
-            logger.debug(f"🔒 Closed browser context for: {test_name}")
-        except Exception as e:
-            logger.warning(f"⚠️ Could not close context: {e}")
-
-
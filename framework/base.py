@@ -2,15 +2,16 @@
 Base classes for Storybook testing framework
 """
 from playwright.sync_api import Page, expect, FrameLocator, Locator
-from typing import Optional, Dict, Any, Callable, TypeVar
+from typing import Optional, Dict, Any, Callable, List, Tuple, TypeVar
 import time
 
 T = TypeVar("T")
 import re
 from pathlib import Path
-from urllib.parse import quote
+from urllib.parse import parse_qs, quote, urlparse
 import sys
 import json
+from functools import lru_cache
 
 # Load configuration
 from framework.config_loader import get_config
@@ -19,6 +20,49 @@ from utils.logger import logger
 config = get_config()
 
 
+@lru_cache(maxsize=None)
+def _read_properties_file(path: str) -> Dict[str, str]:
+    """
+    Parse a key=value .properties file once per run (files are static during a test session).
+    The returned dict is shared between callers - treat it as read-only.
+    """
+    properties = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            properties[key.strip()] = value.strip()
+    return properties
+
+
+@lru_cache(maxsize=None)
+def _read_css_variables_file(path: str) -> Dict[str, str]:
+    """
+    Parse a CSS-variables .properties file (--var: value; or --var=value;) once per run.
+    The returned dict is shared between callers - treat it as read-only.
+    """
+    css_variables = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if ":" in line:
+                var_name, value = line.split(":", 1)
+                var_name = var_name.strip()
+                value = value.strip().rstrip(";").strip()
+                if var_name.startswith("--"):
+                    css_variables[var_name] = value
+            elif "=" in line:
+                key, value = line.split("=", 1)
+                key, value = key.strip(), value.strip()
+                if key.startswith("--"):
+                    css_variables[key] = value
+    return css_variables
+
+
 class StorybookBase:
     """Base class for Storybook test interactions. Story content lives in an iframe."""
     
@@ -28,10 +72,22 @@ class StorybookBase:
         self.page = page
         self.storybook_url = storybook_url or config.STORYBOOK_URL
         self.timeout = config.STORYBOOK_TIMEOUT
+        # (page URL, selector, property) -> declared style; see PropertyChecker.get_declared_style
+        self._declared_cache: Dict[Tuple[str, str, str], str] = {}
+        # page URL -> :root CSS variables; see PropertyChecker.get_all_css_variables_from_root
+        self._root_vars_cache: Dict[str, Dict[str, str]] = {}
+        # Story iframe FrameLocator, built on first use and reset by navigate_to_story
+        self._frame_locator: Optional[FrameLocator] = None
     
     def get_story_frame_locator(self) -> FrameLocator:
         """Frame locator for the story iframe (all components render here)."""
-        return self.page.frame_locator(self.IFRAME_SELECTOR)
+        if self._frame_locator is None:
+            self._frame_locator = self.page.frame_locator(self.IFRAME_SELECTOR)
+        return self._frame_locator
+
+    def get_iframe_frame_locator(self) -> FrameLocator:
+        """Alias for get_story_frame_locator."""
+        return self.get_story_frame_locator()
     
     def get_story_locator(self, selector: str) -> Locator:
         """Locator for an element inside the story iframe."""
@@ -99,6 +155,9 @@ class StorybookBase:
             globals_: Optional dict of Storybook globals (e.g. {"themeMode": "light"}). Overrides theme_mode if both set.
             wait_for_selector: Optional selector to wait for inside the story iframe.
         """
+        self._declared_cache.clear()
+        self._root_vars_cache.clear()
+        self._frame_locator = None
         url = f"{self.storybook_url}/?path=/story/{story_path}"
         if args:
             args_str = self.build_storybook_args_query(args)
@@ -127,17 +186,83 @@ class StorybookBase:
             logger.error(f"Error type: {type(e).__name__}: {e}")
             logger.error(f"Current URL: {self.page.url}")
             raise
-        logger.info("Waiting for Storybook UI to load...")
-        self.page.wait_for_selector("body", timeout=10000)
-        self.page.wait_for_selector("iframe", timeout=10000)
-        logger.info("✅ Storybook page and story iframe ready")
+        # body exists after domcontentloaded; the FrameLocator resolves the iframe lazily, so
+        # only wait for it explicitly when there is no in-story selector to wait on
         if wait_for_selector:
             wait_ms = min(self.timeout, 8000)
-            self.page.frame_locator("iframe").locator(wait_for_selector).first.wait_for(
+            self.get_story_frame_locator().locator(wait_for_selector).first.wait_for(
                 state="visible", timeout=wait_ms
             )
             logger.info("✅ Story iframe selector ready: %s", wait_for_selector)
+        else:
+            logger.info("Waiting for Storybook UI to load...")
+            self.page.locator(self.IFRAME_SELECTOR).first.wait_for(state="attached", timeout=10000)
+            logger.info("✅ Storybook page and story iframe ready")
         
+    def update_story_args(self, story_path: str, args: Dict[str, Any], timeout: int = 3000) -> bool:
+        """
+        Update story args in place through the Storybook channel (no page reload).
+        Emits 'updateStoryArgs' and waits for the next 'storyRendered' event.
+
+        Args:
+            story_path: Story id (e.g. "main-button--primary").
+            args: Dict of story args/controls to set (e.g. {"variant": "primary", "disabled": True}).
+            timeout: Max time in ms to wait for the re-render.
+
+        Returns:
+            True if the story re-rendered with the new args; False if the channel is unavailable
+            or no render happened within timeout (callers should fall back to navigate_to_story).
+        """
+        self._declared_cache.clear()
+        return bool(self.page.evaluate(
+            """([storyId, updatedArgs, timeout]) => new Promise(resolve => {
+                const channel = window.__STORYBOOK_ADDONS_CHANNEL__;
+                if (!channel) return resolve(false);
+                const done = () => { clearTimeout(timer); channel.off('storyRendered', done); resolve(true); };
+                const timer = setTimeout(() => { channel.off('storyRendered', done); resolve(false); }, timeout);
+                channel.on('storyRendered', done);
+                channel.emit('updateStoryArgs', { storyId, updatedArgs });
+            })""",
+            [story_path, args, timeout],
+        ))
+
+    def set_theme_mode(self, theme_mode: str, timeout: int = 3000) -> bool:
+        """
+        Switch the themeMode global in place through the Storybook channel (no page reload).
+        Emits 'updateGlobals' and waits for the next 'storyRendered' event.
+
+        Args:
+            theme_mode: Theme (light, light-hc, dark, dark-hc).
+            timeout: Max time in ms to wait for the re-render.
+
+        Returns:
+            True if the story re-rendered with the new theme; False if the channel is unavailable
+            or no render happened within timeout (callers should fall back to navigate_to_story).
+        """
+        self._declared_cache.clear()
+        self._root_vars_cache.clear()
+        return bool(self.page.evaluate(
+            """([themeMode, timeout]) => new Promise(resolve => {
+                const channel = window.__STORYBOOK_ADDONS_CHANNEL__;
+                if (!channel) return resolve(false);
+                const done = () => { clearTimeout(timer); channel.off('storyRendered', done); resolve(true); };
+                const timer = setTimeout(() => { channel.off('storyRendered', done); resolve(false); }, timeout);
+                channel.on('storyRendered', done);
+                channel.emit('updateGlobals', { globals: { themeMode } });
+            })""",
+            [theme_mode, timeout],
+        ))
+
+    def reset_interaction_state(self):
+        """
+        Clear hover and focus left behind by earlier interactions when the story is updated in place
+        (no reload): moves the pointer to the page corner and blurs the focused element in the story iframe.
+        """
+        self.page.mouse.move(0, 0)
+        self._evaluate_in_story(
+            "body", "const active = doc.activeElement; if (active && active.blur) active.blur(); return null;"
+        )
+
     def get_story_element(self, selector: str = ".sb-story"):
         """Get the main story element"""
         return self.page.locator(selector)
@@ -145,6 +270,31 @@ class StorybookBase:
     def wait_for_animation(self, duration: float = 0.5):
         """Wait for animations to complete"""
         time.sleep(duration)
+
+    def _wait_for_animations(self, locator: Locator, timeout: int = 2000, document_wide: bool = False):
+        """
+        Wait until running CSS animations/transitions on the element (and its subtree) finish;
+        returns immediately if none. Infinite (e.g. spinners) and paused animations are ignored,
+        and the wait is capped at timeout ms so a long animation cannot stall the test.
+        
+        Args:
+            locator: Element whose animations to wait for
+            timeout: Upper bound for the wait in milliseconds
+            document_wide: Wait for every animation in the element's document instead of its subtree
+        """
+        locator.evaluate(
+            """(el, [timeout, documentWide]) => {
+                const animations = documentWide ? el.ownerDocument.getAnimations() : el.getAnimations({subtree: true});
+                const running = animations.filter(a =>
+                    a.playState !== 'paused' && a.effect && a.effect.getComputedTiming().endTime !== Infinity);
+                if (!running.length) return;
+                return Promise.race([
+                    Promise.all(running.map(a => a.finished.catch(() => null))),
+                    new Promise(resolve => setTimeout(resolve, timeout)),
+                ]);
+            }""",
+            [timeout, document_wide],
+        )
         
     def get_component_state(self) -> Dict[str, Any]:
         """Get the current state of the component.
@@ -405,6 +555,7 @@ class PropertyChecker(StorybookBase):
         y = box["y"] + box["height"] / 2
         self.page.mouse.move(x, y)
         self.page.mouse.down()
+        self.clear_declared_style_cache()
         try:
             time.sleep(0.05)  # let :active apply
             if callback is not None:
@@ -413,6 +564,7 @@ class PropertyChecker(StorybookBase):
             return None
         finally:
             self.page.mouse.up()
+            self.clear_declared_style_cache()
 
     def get_attribute(self, selector: str, attribute: str) -> Optional[str]:
         """Get attribute value of an element"""
@@ -449,36 +601,109 @@ class PropertyChecker(StorybookBase):
 
         Example:
             get_declared_style(button_selector, 'background-color')  -> 'var(--color-green-100)'
+
+        Results are cached per (page URL, selector, property) until the next navigation or
+        clear_declared_style_cache() (call it after changing :hover/:active state).
         """
-        return self._evaluate_in_story(
-            selector,
-            """
-            if (!el) return '';
-            const prop = args[1];
-            let value = '';
+        return self.get_declared_styles_bulk(selector, [property_name])[property_name]
+
+    def get_declared_styles_bulk(self, selector: str, properties: List[str]) -> Dict[str, str]:
+        """
+        Get declared CSS values for several properties of one element in a single evaluate
+        (one stylesheet walk for all properties). Same resolution and caching as get_declared_style.
+
+        Args:
+            selector: CSS selector for the element
+            properties: CSS property names in kebab-case (e.g. ['background-color', 'color'])
+
+        Returns:
+            Dict of property name -> declared value ('' if not set)
+        """
+        return self.get_declared_styles_batch({selector: properties})[selector]
+
+    def get_declared_styles_batch(self, selectors_and_props: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+        """
+        Get declared CSS values for several elements and properties in a single evaluate
+        (one stylesheet walk shared by all elements). Uncached values only are fetched.
+
+        Args:
+            selectors_and_props: Dict of CSS selector -> property names in kebab-case
+
+        Returns:
+            Dict of selector -> {property name: declared value ('' if not set or element missing)}
+        """
+        url = self.page.url
+        result: Dict[str, Dict[str, str]] = {}
+        missing: List[List[Any]] = []
+        for selector, properties in selectors_and_props.items():
+            values = result.setdefault(selector, {})
+            todo = []
+            for prop in properties:
+                cached = self._declared_cache.get((url, selector, prop))
+                if cached is None:
+                    todo.append(prop)
+                else:
+                    values[prop] = cached
+            if todo:
+                missing.append([selector, todo])
+        if not missing:
+            return result
+        fetched = self.page.evaluate(
+            """(pairs) => {
+            const iframe = document.querySelector('iframe');
+            const doc = iframe && iframe.contentDocument;
+            const out = {};
+            const targets = [];
+            for (const [sel, props] of pairs) {
+              const values = {};
+              for (const p of props) values[p] = '';
+              out[sel] = values;
+              const el = doc ? doc.querySelector(sel) : null;
+              if (el) targets.push({ el, props, values });
+            }
+            if (!targets.length) return out;
             function collectRules(sheet) {
               try {
                 if (!sheet || !sheet.cssRules) return;
                 for (let i = 0; i < sheet.cssRules.length; i++) {
                   const r = sheet.cssRules[i];
                   if (r.selectorText) {
-                    try {
-                      if (el.matches(r.selectorText)) {
-                        const v = r.style.getPropertyValue(prop);
-                        if (v) value = v;
-                      }
-                    } catch (_) {}
+                    for (const t of targets) {
+                      try {
+                        if (t.el.matches(r.selectorText)) {
+                          for (const p of t.props) {
+                            const v = r.style.getPropertyValue(p);
+                            if (v) t.values[p] = v;
+                          }
+                        }
+                      } catch (_) {}
+                    }
                   } else if (r.cssRules) collectRules(r);
                 }
               } catch (_) {}
             }
             for (let i = 0; i < doc.styleSheets.length; i++) collectRules(doc.styleSheets[i]);
-            const inline = el.style.getPropertyValue(prop);
-            if (inline) value = inline;
-            return value;
-            """,
-            property_name,
-        ) or ""
+            for (const t of targets) {
+              for (const p of t.props) {
+                const inline = t.el.style.getPropertyValue(p);
+                if (inline) t.values[p] = inline;
+              }
+            }
+            return out;
+            }""",
+            missing,
+        ) or {}
+        for selector, todo in missing:
+            values = fetched.get(selector) or {}
+            for prop in todo:
+                value = values.get(prop) or ""
+                self._declared_cache[(url, selector, prop)] = value
+                result[selector][prop] = value
+        return result
+
+    def clear_declared_style_cache(self):
+        """Forget cached get_declared_style results (e.g. after hover/press changes matching rules)."""
+        self._declared_cache.clear()
 
     def get_all_computed_styles(self, selector: str) -> Dict[str, str]:
         """
@@ -497,6 +722,48 @@ class PropertyChecker(StorybookBase):
             return r;""",
         ) or {}
     
+    # Locator.evaluate body: computed values of the given properties for one element
+    _COMPUTED_STYLES_JS = """(el, props) => {
+        const s = el.ownerDocument.defaultView.getComputedStyle(el);
+        return props.reduce((o, p) => (o[p] = s.getPropertyValue(p) || s[p] || '', o), {});
+    }"""
+
+    def batch_computed_styles(self, selectors: List[str], properties: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Read several computed CSS properties for several elements (in story iframe) in one evaluate.
+        Selectors that are not plain CSS (Playwright-only syntax such as :has-text()) are resolved
+        through a story locator instead, one evaluate each.
+
+        Args:
+            selectors: CSS or Playwright selectors for the elements
+            properties: CSS property names in kebab-case (e.g. 'background-color', 'color')
+
+        Returns:
+            Dict of selector -> {property name: computed value}; missing elements map to {}
+        """
+        js = """([sels, props]) => {
+            const iframe = document.querySelector('iframe');
+            const doc = iframe && iframe.contentDocument;
+            if (!doc) return null;
+            const view = doc.defaultView;
+            return sels.map(sel => {
+                let el;
+                try { el = doc.querySelector(sel); } catch (_) { return null; }
+                if (!el) return {};
+                const s = view.getComputedStyle(el);
+                return props.reduce((o, p) => (o[p] = s.getPropertyValue(p) || s[p] || '', o), {});
+            });
+        }"""
+        results = self.page.evaluate(js, [list(selectors), list(properties)]) or [{}] * len(selectors)
+        styles = {}
+        for selector, values in zip(selectors, results):
+            if values is None:
+                # Not valid CSS for querySelector - let Playwright's selector engine resolve it
+                locator = self.get_story_locator(selector)
+                values = locator.evaluate(self._COMPUTED_STYLES_JS, list(properties)) if locator.count() else {}
+            styles[selector] = values
+        return styles
+
     def verify_property(self, selector: str, property_name: str, expected_value: str, tolerance: float = None):
         """
         Verify CSS property value matches expected value
@@ -796,27 +1063,54 @@ class PropertyChecker(StorybookBase):
         If component_name is None, infers from class name (e.g. ButtonComponent -> 'button').
         """
         
-        components_dir = self._components_dir()
-        component_dir = components_dir / component_name
-        properties_file = component_dir / f"{component_name}.properties"
-        properties = {}
+        properties_file = self._components_dir() / component_name / f"{component_name}.properties"
         if not properties_file.exists():
             logger.warning("⚠️ Properties file not found: %s", properties_file)
-            return properties
+            return {}
         try:
-            with open(properties_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if "=" in line:
-                        key, value = line.split("=", 1)
-                        key, value = key.strip(), value.strip()
-                        if not key.startswith("css-var."):
-                            properties[key] = value
+            return {
+                key: value
+                for key, value in _read_properties_file(str(properties_file)).items()
+                if not key.startswith("css-var.")
+            }
         except Exception as e:
             logger.error("❌ Error loading properties from %s: %s", properties_file, e)
-        return properties
+            return {}
+
+    def load_component_properties_by_prefix(
+        self,
+        component_name: str,
+        prefix: str,
+        properties_filename: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Load properties whose key starts with prefix, with the prefix stripped from the keys.
+        Filters the cached parse of the .properties file (no disk read after the first call).
+
+        Args:
+            component_name: e.g. 'button'
+            prefix: key prefix including the trailing dot (e.g. 'primary.active.large.')
+            properties_filename: e.g. 'button.properties'; default is '{component_name}.properties'
+
+        Returns:
+            Dict of stripped key -> value ({} if the file is missing)
+        """
+        if properties_filename is None:
+            properties_filename = f"{component_name}.properties"
+        properties_file = self._components_dir() / component_name / properties_filename
+        if not properties_file.exists():
+            logger.warning("⚠️ Properties file not found: %s", properties_file)
+            return {}
+        try:
+            n = len(prefix)
+            return {
+                key[n:]: value
+                for key, value in _read_properties_file(str(properties_file)).items()
+                if key.startswith(prefix)
+            }
+        except Exception as e:
+            logger.error("❌ Error loading properties from %s: %s", properties_file, e)
+            return {}
 
     def load_component_properties_for_variant(
         self,
@@ -839,63 +1133,22 @@ class PropertyChecker(StorybookBase):
             properties_filename: e.g. 'button.properties'; default is '{component_name}.properties'
         """
 
-        if properties_filename is None:
-            properties_filename = f"{component_name}.properties"
-
-        components_dir = self._components_dir()
-        component_dir = components_dir / component_name
-        properties_file = component_dir / properties_filename
         prefix = f"{variant.lower()}.{state.lower()}.{size.lower()}."
-        result = {}
-        if not properties_file.exists():
-            logger.warning("⚠️ Variant properties file not found: %s", properties_file)
-            return result
-        try:
-            with open(properties_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if "=" not in line:
-                        continue
-                    key, value = line.split("=", 1)
-                    key, value = key.strip(), value.strip()
-                    if key.startswith(prefix):
-                        prop_name = key[len(prefix) :]
-                        result[prop_name] = value
-        except Exception as e:
-            logger.error("❌ Error loading variant properties from %s: %s", properties_file, e)
-        return result
+        return self.load_component_properties_by_prefix(component_name, prefix, properties_filename)
 
     def load_css_variables_from_file(self, file_path: Path) -> Dict[str, str]:
-        """Load CSS variables from a .properties file (--var: value; or --var=value;)."""
-        css_variables = {}
+        """Load CSS variables from a .properties file (--var: value; or --var=value;). Parsed once per path per run."""
         if not file_path.exists():
             logger.warning("Properties file not found: %s", file_path)
-            return css_variables
+            return {}
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if ":" in line:
-                        parts = line.split(":", 1)
-                        if len(parts) == 2:
-                            var_name = parts[0].strip()
-                            value = parts[1].strip().rstrip(";").strip()
-                            if var_name.startswith("--"):
-                                css_variables[var_name] = value
-                    elif "=" in line:
-                        key, value = line.split("=", 1)
-                        key, value = key.strip(), value.strip()
-                        if key.startswith("--"):
-                            css_variables[key] = value
+            css_variables = _read_css_variables_file(str(file_path.resolve()))
             if not css_variables:
                 logger.warning("No CSS variables found in %s", file_path.name)
+            return css_variables
         except Exception as e:
             logger.error("Error loading %s: %s", file_path.name, e)
-        return css_variables
+            return {}
 
     def load_css_variables(self, component_name: Optional[str] = None) -> Dict[str, str]:
         """Load CSS variable definitions from components/css-variables.properties."""
@@ -916,17 +1169,15 @@ class PropertyChecker(StorybookBase):
         }
         if not regular_properties:
             return
-        component = self.get_story_locator(selector)
         mismatches = []
         logger.info("Verifying %s component properties (excluding CSS variables)...", len(regular_properties))
+        # Wait for the element once, then read every property in a single evaluate. Goes through
+        # the locator so Playwright-only selectors (e.g. :has-text()) work too.
+        element = self.get_story_locator(selector)
+        element.wait_for(state="attached", timeout=self.timeout)
+        actual_styles = element.evaluate(self._COMPUTED_STYLES_JS, list(regular_properties))
         for property_name, expected in regular_properties.items():
-            js_code = """
-                (element, propName) => {
-                    const styles = window.getComputedStyle(element);
-                    return styles.getPropertyValue(propName) || styles[propName] || '';
-                }
-            """
-            actual_value = component.evaluate(js_code, property_name)
+            actual_value = actual_styles.get(property_name, "")
             if isinstance(expected, tuple):
                 expected_value, tolerance = expected
                 if tolerance is not None:
@@ -1061,7 +1312,15 @@ class PropertyChecker(StorybookBase):
         if mismatches:
             raise AssertionError("Found %s CSS variable mismatch(es):\n  - %s" % (len(mismatches), "\n  - ".join(mismatches)))
     def get_all_css_variables_from_root(self) -> Dict[str, str]:
-        """Extract all CSS variables from :root in the story iframe."""
+        """
+        Extract all CSS variables from :root in the story iframe.
+        Cached per page URL (theme globals are part of the URL) until the next navigation;
+        the returned dict is shared - treat it as read-only.
+        """
+        url = self.page.url
+        cached = self._root_vars_cache.get(url)
+        if cached is not None:
+            return cached
         frame = self.get_story_frame_locator()
         js_code = """
             () => {
@@ -1105,7 +1364,9 @@ class PropertyChecker(StorybookBase):
         try:
             body_locator = frame.locator("body")
             css_vars = body_locator.evaluate(js_code)
-            return {k: v for k, v in (css_vars or {}).items() if v and v.strip()}
+            result = {k: v for k, v in (css_vars or {}).items() if v and v.strip()}
+            self._root_vars_cache[url] = result
+            return result
         except Exception as e:
             logger.warning("⚠️ Error extracting CSS variables from :root: %s", e)
             return {}
@@ -1221,6 +1482,7 @@ class StorybookControlsManager(StorybookBase):
         args: Dict[str, Any],
         globals_: Optional[Dict[str, str]] = None,
         wait_for_selector: Optional[str] = None,
+        theme_mode: Optional[str] = None,
     ):
         """
         Navigate to a story with controls set via URL args (no API/UI needed).
@@ -1231,9 +1493,11 @@ class StorybookControlsManager(StorybookBase):
             args: Dict of story args/controls (e.g. {"variant": "primary", "disabled": True, "children": "Label"}).
             globals_: Optional globals (e.g. {"themeMode": "light"}).
             wait_for_selector: Optional selector to wait for inside the story iframe.
+            theme_mode: Optional theme (light, dark, etc.) – ignored if globals_ is set.
         """
         self.navigate_to_story(
             story_path,
+            theme_mode=theme_mode,
             args=args,
             globals_=globals_,
             wait_for_selector=wait_for_selector,
@@ -1258,7 +1522,7 @@ class StorybookControlsManager(StorybookBase):
         
         try:
             # Wait for control to be available
-            self.page.wait_for_selector(control_selector, timeout=5000)
+            self.page.locator(control_selector).first.wait_for(state="visible", timeout=5000)
             
             # Determine control type and update accordingly
             control_element = self.page.locator(control_selector).first
@@ -1298,36 +1562,37 @@ class StorybookControlsManager(StorybookBase):
         Returns:
             Current value of the control
         """
-        self.navigate_to_story(story_path)
-        
-        # Try to get value from Storybook API
-        result = self.page.evaluate(f"""() => {{
-            if (window.parent && window.parent.__STORYBOOK_STORY_STORE__) {{
-                const store = window.parent.__STORYBOOK_STORY_STORE__;
-                const storyId = '{story_path}';
-                const currentStory = store.getState().storiesHash[storyId];
-                if (currentStory && currentStory.args) {{
-                    return {{ success: true, value: currentStory.args['{arg_name}'] }};
-                }}
-            }}
-            
-            if (window.__STORYBOOK_STORY_STORE__) {{
-                const store = window.__STORYBOOK_STORY_STORE__;
-                const storyId = '{story_path}';
+        args = self._read_story_args(story_path)
+        if args is not None:
+            return args.get(arg_name)
+        # Fallback: get from UI
+        return self._get_control_value_via_ui(story_path, arg_name)
+    
+    def _read_story_args(self, story_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Read all current args of a story from the Storybook store in one evaluate.
+        Navigates only if the page is not already on story_path (navigating would reset args).
+
+        Returns:
+            Dict of arg name -> value, or None if the store is not reachable
+        """
+        # Storybook keeps the story id in the ?path= query; compare it exactly so that e.g.
+        # example-button--primary does not match example-button--primary-large
+        current_path = parse_qs(urlparse(self.page.url).query).get("path", [""])[0]
+        if current_path != f"/story/{story_path}":
+            self.navigate_to_story(story_path)
+        result = self.page.evaluate("""(storyId) => {
+            for (const win of [window.parent, window]) {
+                const store = win && win.__STORYBOOK_STORY_STORE__;
+                if (!store) continue;
                 const currentStory = store.getState().storiesHash[storyId];
-                if (currentStory && currentStory.args) {{
-                    return {{ success: true, value: currentStory.args['{arg_name}'] }};
-                }}
-            }}
-            
-            return {{ success: false }};
-        }}""")
-        
-        if result.get("success"):
-            return result.get("value")
-        else:
-            # Fallback: get from UI
-            return self._get_control_value_via_ui(story_path, arg_name)
+                if (currentStory && currentStory.args) {
+                    return { success: true, args: currentStory.args };
+                }
+            }
+            return { success: false };
+        }""", story_path)
+        return result.get("args", {}) if result.get("success") else None
     
     def _get_control_value_via_ui(self, story_path: str, arg_name: str) -> Any:
         """Get control value from UI (fallback)"""
@@ -1336,7 +1601,7 @@ class StorybookControlsManager(StorybookBase):
         control_selector = f"[data-testid='control-{arg_name}'], [name='{arg_name}'], input[name*='{arg_name}']"
         
         try:
-            self.page.wait_for_selector(control_selector, timeout=5000)
+            self.page.locator(control_selector).first.wait_for(state="visible", timeout=5000)
             control_element = self.page.locator(control_selector).first
             
             input_type = control_element.get_attribute("type")
@@ -1386,34 +1651,7 @@ class StorybookControlsManager(StorybookBase):
         Returns:
             Dictionary of all control names and their current values
         """
-        self.navigate_to_story(story_path)
-        
-        result = self.page.evaluate(f"""() => {{
-            if (window.parent && window.parent.__STORYBOOK_STORY_STORE__) {{
-                const store = window.parent.__STORYBOOK_STORY_STORE__;
-                const storyId = '{story_path}';
-                const currentStory = store.getState().storiesHash[storyId];
-                if (currentStory && currentStory.args) {{
-                    return {{ success: true, args: currentStory.args }};
-                }}
-            }}
-            
-            if (window.__STORYBOOK_STORY_STORE__) {{
-                const store = window.__STORYBOOK_STORY_STORE__;
-                const storyId = '{story_path}';
-                const currentStory = store.getState().storiesHash[storyId];
-                if (currentStory && currentStory.args) {{
-                    return {{ success: true, args: currentStory.args }};
-                }}
-            }}
-            
-            return {{ success: false }};
-        }}""")
-        
-        if result.get("success"):
-            return result.get("args", {})
-        else:
-            return {}
+        return self._read_story_args(story_path) or {}
     
     def reset_controls_to_defaults(self, story_path: str):
         """
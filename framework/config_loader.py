@@ -136,6 +136,20 @@ class ConfigLoader:
         
         self.VIEWPORT_WIDTH = int(self._get_property('browser.viewport_width', '1920'))
         self.VIEWPORT_HEIGHT = int(self._get_property('browser.viewport_height', '1080'))
+        
+        # Optional storage-state file (relative to config dir); empty disables it
+        storage_state = self._get_property('browser.storage_state', '').strip()
+        self.STORAGE_STATE = self.BASE_DIR / storage_state if storage_state else None
+        
+        # Browser event logging (console/requests, HTTP errors); off by default, see conftest page fixture
+        verbose_value = self._get_property('browser.verbose_logs', 'false').lower()
+        self.VERBOSE_BROWSER_LOGS = verbose_value in ('true', '1', 'yes')
+        http_errors_value = self._get_property('browser.log_http_errors', 'false').lower()
+        self.LOG_HTTP_ERRORS = http_errors_value in ('true', '1', 'yes')
+        
+        # Playwright tracing, kept only for failed tests (off by default)
+        trace_value = self._get_property('browser.trace_on_failure', 'false').lower()
+        self.TRACE_ON_FAILURE = trace_value in ('true', '1', 'yes')
     
     def _create_directories(self):
         """Create necessary directories if they don't exist"""